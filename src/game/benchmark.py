@@ -0,0 +1,248 @@
+"""
+Headless solver benchmarks: every strategy on the polyhedra, 2d/3d grids of growing size and discocubes.
+Measures time to the first cycle (to the goal for walk), nodes expanded per second, peak memory and full enumeration
+time within a budget. Memory is traced with tracemalloc in a separate run, so it does not slow the timed one, and not
+for the process pool, whose workers it cannot see. Seeds are fixed, results are written as JSON, and a compare mode
+flags regressions against a stored baseline.
+
+    python -m src.game.benchmark --out bench.json
+    python -m src.game.benchmark --out new.json --compare bench.json
+"""
+import argparse
+from collections import deque
+from datetime import datetime
+import json
+import platform
+import sys
+from time import perf_counter
+import tracemalloc
+
+from src.game.defs import G_POLYHEDRA, G_TYPES
+from src.game.discocube import discocube
+from src.game.held_karp import count_cycles
+from src.game.parallel import PoolSolver
+from src.game.search import SearchStats
+from src.game.symmetry import Symmetry
+from src.game.utils import ae_for_grid, walk, walker
+
+GRIDS = ((4, 4), (6, 6), (8, 8), (10, 10), (2, 2, 2), (4, 4, 2), (4, 4, 4))
+DISCOCUBES = (32, 80, 160)
+LOWER_IS_BETTER = ('first_cycle', 'goal', 'enumeration', 'peak_bytes')
+HIGHER_IS_BETTER = ('rate',)
+
+
+def cases(quick=False):
+    """
+    (name, adjacency) of every benchmarked board.
+    """
+    for name in G_TYPES:
+        yield name, G_POLYHEDRA[name]['A']
+    for dims in GRIDS[:3] + GRIDS[4:6] if quick else GRIDS:
+        yield f"grid{'x'.join(map(str, dims))}", ae_for_grid(*dims)[0]
+    for ORD in DISCOCUBES[:2] if quick else DISCOCUBES:
+        yield f'discocube{ORD}', discocube(ORD)
+
+
+def farthest(A, start=0):
+    """
+    A node at the largest breadth-first distance from start.
+    """
+    seen, queue, node = {start}, deque([start]), start
+    while queue:
+        node = queue.popleft()
+        for n in A[node]:
+            if n not in seen:
+                seen.add(n)
+                queue.append(n)
+    return node
+
+
+def walk_cycles(A, seed, budget, **kwargs):
+    """
+    utils.walker: time to the first cycle, then on to exhaustion or the budget.
+    """
+    stats, cycles, first, done = SearchStats(), 0, None, True
+    start = perf_counter()
+    for _ in walker(A, seed=seed, stats=stats, **kwargs):
+        if stats.cycles > cycles:
+            cycles = stats.cycles
+            first = first or perf_counter() - start
+        if perf_counter() - start > budget:
+            done = False
+            break
+    elapsed = perf_counter() - start
+    return {'first_cycle': first, 'expanded': stats.expanded, 'elapsed': elapsed,
+            'rate': stats.expanded / elapsed if elapsed else None, 'enumeration': elapsed if done else None,
+            'cycles': stats.cycles // 2 if done else None, 'complete': done}
+
+
+def walk_goal(A, seed, budget):
+    """
+    utils.walk: a path from node 0 to the farthest node after which the cycle can still close, within the budget.
+    """
+    stats, goal = SearchStats(), farthest(A)
+    start = perf_counter()
+    path = walk.__wrapped__(A, start=0, goal=goal, order='warnsdorff', seed=seed, stats=stats, feasible=True, origin=0,
+                            deadline=start + budget)
+    elapsed = perf_counter() - start
+    return {'goal': elapsed if path is not None else None, 'expanded': stats.expanded, 'elapsed': elapsed,
+            'rate': stats.expanded / elapsed if elapsed else None, 'found': path is not None}
+
+
+def counted(count):
+    """
+    Wrap a cycle counter: enumeration time and count.
+    """
+    def run(A, seed, budget):  # noqa
+        """
+        Count the cycles of A.
+        """
+        start = perf_counter()
+        cycles = count(A)
+        elapsed = perf_counter() - start
+        return {'enumeration': elapsed, 'elapsed': elapsed, 'cycles': cycles, 'complete': True}
+    return run
+
+
+# name: (run, largest order it is run on, if it can only run to completion)
+STRATEGIES = {
+    'walker': (lambda A, seed, budget: walk_cycles(A, seed, budget, order='warnsdorff', feasible=True), None, False),
+    'walker-table': (lambda A, seed, budget: walk_cycles(A, seed, budget, order='warnsdorff', feasible=True, table=1 << 16),
+                     None, False),
+    'walker-brute': (lambda A, seed, budget: walk_cycles(A, seed, budget, order='first'), 40, False),
+    'walk': (walk_goal, None, False),
+    'held-karp': (counted(count_cycles), 24, True),
+    'pool': (counted(lambda A: PoolSolver(A, workers=2).count()), 40, True),
+    'symmetry': (counted(lambda A: sum(size for _, size in Symmetry(A).cycles())), 40, True),
+}
+# strategies working in other processes, which tracemalloc does not see: no peak_bytes
+UNTRACED = ('pool',)
+
+
+def measure(run, A, seed, budget, memory=True, repeat=3):
+    """
+    Best metrics of repeat timed runs (stopping early once a run takes over the budget), plus the peak memory of a
+    traced run.
+    """
+    result = run(A, seed, budget)
+    for _ in range(repeat - 1):
+        if result['elapsed'] > budget:
+            break
+        again = run(A, seed, budget)
+        for metric in LOWER_IS_BETTER + HIGHER_IS_BETTER + ('elapsed',):
+            if result.get(metric) is not None and again.get(metric) is not None:
+                better = max if metric in HIGHER_IS_BETTER else min
+                result[metric] = better(result[metric], again[metric])
+    if memory:
+        tracemalloc.start()
+        try:
+            run(A, seed, budget)
+            result['peak_bytes'] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return result
+
+
+def benchmark(strategies=None, names=None, seed=0, budget=5.0, memory=True, quick=False, repeat=3):
+    """
+    Run the strategies on the boards.
+    The counters, which cannot stop early, are skipped on a board that a walker failed to enumerate within budget.
+    :return: JSON-ready report: metadata and one result per (board, strategy).
+    """
+    results = []
+    for name, A in cases(quick=quick):
+        if names and name not in names:
+            continue
+        enumerable = True
+        for strategy, (run, max_order, exhaustive) in STRATEGIES.items():
+            if strategies and strategy not in strategies or max_order is not None and len(A) > max_order:
+                continue
+            if exhaustive and not enumerable:
+                continue
+            metrics = measure(run, A, seed, budget, memory=memory and strategy not in UNTRACED, repeat=repeat)
+            result = {'case': name, 'strategy': strategy, 'ORD': len(A), **metrics}
+            enumerable &= result.get('complete', True)
+            results.append(result)
+            print(format_result(result), file=sys.stderr)
+    meta = {'date': datetime.now().isoformat(timespec='seconds'), 'python': platform.python_version(),
+            'platform': platform.platform(), 'seed': seed, 'budget': budget, 'repeat': repeat}
+    return {'meta': meta, 'results': results}
+
+
+def format_result(result):
+    """
+    One line summary of a result.
+    """
+    cells = [f"{result['case']:>14} {result['strategy']:<13}"]
+    units = (('first_cycle', 's', 1), ('goal', 's', 1), ('rate', 'k/s', 1e-3), ('enumeration', 's', 1),
+             ('peak_bytes', 'MB', 1e-6))
+    for key, unit, scale in units:
+        if result.get(key) is not None:
+            cells.append(f'{key}: {result[key] * scale:.4g}{unit}')
+    if result.get('cycles') is not None:
+        cells.append(f"cycles: {result['cycles']}")
+    if result.get('found') is False:
+        cells.append('not found')
+    return '  '.join(cells)
+
+
+def compare(report, baseline, threshold=.25, floor=.01):
+    """
+    Regressions of report against baseline: metrics worse by more than threshold (relative), or a changed cycle count.
+    Timings below floor seconds, and rates over runs that short, are too noisy to compare.
+    :return: (case, strategy, metric, baseline value, new value) of every regression.
+    """
+    known = {(r['case'], r['strategy']): r for r in baseline['results']}
+    regressions = []
+    for result in report['results']:
+        if (old := known.get((result['case'], result['strategy']))) is None:
+            continue
+        for metric in LOWER_IS_BETTER + HIGHER_IS_BETTER:
+            before, after = old.get(metric), result.get(metric)
+            if before is None or after is None:
+                continue
+            if metric in HIGHER_IS_BETTER and min(old['elapsed'], result['elapsed']) < floor:
+                continue
+            if metric != 'peak_bytes' and metric in LOWER_IS_BETTER and max(before, after) < floor:
+                continue
+            worse = after > before * (1 + threshold) if metric in LOWER_IS_BETTER else after < before * (1 - threshold)
+            if worse:
+                regressions.append((result['case'], result['strategy'], metric, before, after))
+        if old.get('cycles') is not None and result.get('cycles') is not None and old['cycles'] != result['cycles']:
+            regressions.append((result['case'], result['strategy'], 'cycles', old['cycles'], result['cycles']))
+    return regressions
+
+
+def main():
+    """
+    Run the benchmarks from the command line; exits with 1 if a comparison finds regressions.
+    """
+    parser = argparse.ArgumentParser(description='Solver benchmarks.')
+    parser.add_argument('--out', help='write the report to this JSON file')
+    parser.add_argument('--compare', help='baseline JSON report to compare against')
+    parser.add_argument('--threshold', type=float, default=.25, help='relative change counted as a regression')
+    parser.add_argument('--strategies', help=f"comma separated, of: {', '.join(STRATEGIES)}")
+    parser.add_argument('--cases', help='comma separated board names')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--budget', type=float, default=5.0, help='seconds per enumeration')
+    parser.add_argument('--repeat', type=int, default=3, help='timed runs per case, the best is kept')
+    parser.add_argument('--no-memory', action='store_true', help='skip the traced runs')
+    parser.add_argument('--quick', action='store_true', help='smaller grids and discocubes')
+    args = parser.parse_args()
+    report = benchmark(strategies=args.strategies and args.strategies.split(','), names=args.cases and args.cases.split(','),
+                       seed=args.seed, budget=args.budget, memory=not args.no_memory, quick=args.quick,
+                       repeat=args.repeat)
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(report, f, indent=1)
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(report, json.load(f), threshold=args.threshold)
+        for case, strategy, metric, before, after in regressions:
+            print(f'REGRESSION {case} {strategy} {metric}: {before:.4g} -> {after:.4g}')
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,169 @@
+"""
+Streaming, resumable census of the hamiltonian cycles of a board.
+Cycles go to disk in chunks as they are found, each undirected cycle once, written from the first node:
+either a binary file in the SolutionStore layout (so the game can load it) or JSONL, one cycle per line.
+The DFS stack is saved periodically to a checkpoint next to the output; a killed census resumes from it,
+truncating the output to the offset the checkpoint recorded.
+
+    python -m src.game.census DISCO disco.cycles
+"""
+import argparse
+import json
+import os
+from time import perf_counter
+
+import numpy as np
+
+from src.game.defs import G_POLYHEDRA
+from src.game.ordering import move_order
+from src.game.pruning import DeadEnds
+from src.game.search import BitSearch
+from src.game.store import HEADER, MAGIC, VERSION, graph_hash, node_dtype
+from src.game.utils import get_G
+
+
+class Census:
+    """
+    Enumeration of every hamiltonian cycle of A into filename (.jsonl for text), checkpointed to filename.ckpt.
+    Cycles are written as node ids, so A is numbered like a Graph.
+    chunk: cycles buffered before a write.
+    every: seconds between checkpoints.
+    """
+    def __init__(self, A, filename, chunk=4096, every=60, order=None, feasible=True):
+        self.A = A
+        self.ORD = len(A)
+        self.hash = graph_hash(A)
+        self.filename = filename
+        self.checkpoint = f'{filename}.ckpt'
+        self.jsonl = filename.endswith('.jsonl')
+        self.dtype = node_dtype(self.ORD)
+        self.chunk = chunk
+        self.every = every
+        self.order = order
+        self.feasible = feasible
+        self.search = BitSearch(A, start=(min(A),), move=move_order(order), pruner=DeadEnds if feasible else None)
+        self.stats = self.search.stats
+        self.found = 0
+        self.elapsed = 0
+        self.offset = 0
+        self.done = False
+        self.buffer = []
+
+    def open_output(self):
+        """
+        Resume from the checkpoint if there is one, else start the output over.
+        :return: the output file, positioned at its end.
+        """
+        if os.path.exists(self.checkpoint):
+            self.resume()
+            f = open(self.filename, 'r+b')
+            f.truncate(self.offset)
+            f.seek(self.offset)
+            return f
+        f = open(self.filename, 'wb')
+        if not self.jsonl:
+            f.write(HEADER.pack(MAGIC, VERSION, np.dtype(self.dtype).itemsize, self.ORD, self.hash))
+        self.offset = f.tell()
+        return f
+
+    def resume(self):
+        """
+        Restore the DFS stack and counters from the checkpoint.
+        """
+        with open(self.checkpoint) as f:
+            state = json.load(f)
+        if bytes.fromhex(state['hash']) != self.hash or state['feasible'] != self.feasible:
+            raise ValueError(f'{self.checkpoint} is a checkpoint of another census')
+        search = self.search
+        search.path[:] = state['path']
+        for d, alt in enumerate(state['alts']):
+            search.alts[d] = alt
+        search.visited = state['visited']
+        self.stats.expanded, self.stats.cycles, self.stats.pruned = state['expanded'], state['cycles'], state['pruned']
+        self.found, self.elapsed, self.offset, self.done = state['found'], state['elapsed'], state['offset'], state['done']
+
+    def save(self, f):
+        """
+        Flush the buffered cycles, then atomically replace the checkpoint with the current DFS stack.
+        """
+        self.flush(f)
+        f.flush()
+        os.fsync(f.fileno())
+        self.offset = f.tell()
+        search = self.search
+        state = {
+            'hash': self.hash.hex(), 'feasible': self.feasible, 'done': self.done,
+            'path': search.path, 'alts': list(search.alts[:len(search.path)]), 'visited': search.visited,
+            'expanded': self.stats.expanded, 'cycles': self.stats.cycles, 'pruned': self.stats.pruned,
+            'found': self.found, 'elapsed': self.elapsed, 'offset': self.offset,
+        }
+        with open(f'{self.checkpoint}.tmp', 'w') as ckpt:
+            json.dump(state, ckpt)
+        os.replace(f'{self.checkpoint}.tmp', self.checkpoint)
+
+    def flush(self, f):
+        """
+        Write the buffered cycles.
+        """
+        if self.buffer:
+            if self.jsonl:
+                f.write(''.join(json.dumps(cycle) + '\n' for cycle in self.buffer).encode())
+            else:
+                f.write(np.array(self.buffer, dtype=self.dtype).tobytes())
+            self.buffer.clear()
+
+    def run(self, stop=None):
+        """
+        Enumerate until done, or until stop seconds have passed (the run is then checkpointed for later).
+        :return: number of (undirected) cycles written so far.
+        """
+        search, started = self.search, perf_counter()
+        last, paused = started, False
+
+        def halt():
+            """
+            Pause the walk when a checkpoint is due.
+            """
+            nonlocal paused
+            now = perf_counter()
+            paused = now - last >= self.every or stop is not None and now - started >= stop
+            return paused
+
+        search.halt = halt
+        with self.open_output() as f:
+            while not self.done:
+                paused = False
+                for cycle in search.walker(trace=False):
+                    if search.path[1] < search.path[-1]:
+                        self.found += 1
+                        self.buffer.append(cycle[:])
+                        if len(self.buffer) >= self.chunk:
+                            self.flush(f)
+                now = perf_counter()
+                self.elapsed += now - last
+                last, self.done = now, not paused
+                self.save(f)
+                if stop is not None and now - started >= stop:
+                    break
+        return self.found
+
+
+def main():
+    """
+    Run a census from the command line, resuming it if a checkpoint exists.
+    """
+    parser = argparse.ArgumentParser(description='Streaming census of the hamiltonian cycles of a board.')
+    parser.add_argument('board', help='polyhedron name, or the order of a discocube graph loaded with get_G')
+    parser.add_argument('output', help='cycles file, .jsonl for text')
+    parser.add_argument('--every', type=float, default=60, help='seconds between checkpoints')
+    parser.add_argument('--stop', type=float, default=None, help='seconds to run before pausing')
+    parser.add_argument('--order', default=None, help="move ordering: 'first', 'random' or 'warnsdorff'")
+    args = parser.parse_args()
+    A = G_POLYHEDRA[args.board]['A'] if args.board in G_POLYHEDRA else get_G(int(args.board))['A']
+    census = Census(A, args.output, every=args.every, order=args.order)
+    found = census.run(stop=args.stop)
+    print(f'{found} cycles, {census.stats}, {census.elapsed:.1f} secs')
+
+
+if __name__ == '__main__':
+    main()
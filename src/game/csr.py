@@ -0,0 +1,55 @@
+"""
+Compressed sparse row adjacency: vectorized NumPy builders, read through graph.Graph.
+Node n's neighbors are indices[indptr[n]:indptr[n + 1]], sorted. Edges are an (m, 2) array with u < v.
+"""
+import numpy as np
+
+
+def node_index_dtype(ORD):
+    """
+    Index dtype for ORD nodes.
+    """
+    return np.int32 if ORD < 1 << 31 else np.int64
+
+
+def csr_from_edges(edges, ORD):
+    """
+    indptr, indices of the undirected graph with the given edges over nodes 0..ORD-1.
+    """
+    dtype = node_index_dtype(ORD)
+    edges = np.asarray(edges, dtype=dtype).reshape(-1, 2)
+    src = np.concatenate((edges[:, 0], edges[:, 1]))
+    dst = np.concatenate((edges[:, 1], edges[:, 0]))
+    order = np.lexsort((dst, src))
+    indptr = np.zeros(ORD + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=ORD), out=indptr[1:])
+    return indptr, dst[order]
+
+
+def grid_edges(x, y, z=None):
+    """
+    Edges of the x by y (by z) grid, node ix + x * iy + x * y * iz, as in utils.ae_for_grid.
+    """
+    ids = np.arange(x * y * (z or 1), dtype=node_index_dtype(x * y * (z or 1))).reshape(z or 1, y, x)
+    pairs = [(ids[:, :, :-1], ids[:, :, 1:]), (ids[:, :-1, :], ids[:, 1:, :])]
+    if z:
+        pairs.append((ids[:-1], ids[1:]))
+    return np.concatenate([np.stack((u.ravel(), v.ravel()), axis=1) for u, v in pairs])
+
+
+def grid_coords(x, y, z=None):
+    """
+    Integer coordinates (ix, iy[, iz]) of every grid node, one row per node.
+    """
+    grids = np.indices((z or 1, y, x)).reshape(3, -1)[::-1]
+    return (grids if z else grids[:2]).T.copy()
+
+
+def grid_csr(x, y, z=None, coords=False):
+    """
+    CSR arrays of a 2d grid, or a 3d grid when z is given.
+    :return: indptr, indices, edges, and the node coordinates if coords else None.
+    """
+    edges = grid_edges(x, y, z)
+    indptr, indices = csr_from_edges(edges, x * y * (z or 1))
+    return indptr, indices, edges, grid_coords(x, y, z) if coords else None
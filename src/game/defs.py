@@ -6,9 +6,12 @@ import os
 from random import randint
 
 
-# ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
-ROOT_DIR = '/home/rommelo/Repos/walk_the_loop/src/game'
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
 ICONS_DIR = os.path.join(ROOT_DIR, 'static/icons')
+DATA_DIR = os.environ.get('WALK_THE_LOOP_DATA', os.path.join(os.path.expanduser('~'), '.walk_the_loop'))
+SOLUTIONS_DIR = os.path.join(DATA_DIR, 'solutions')
+GRAPHS_DIR = os.environ.get('WALK_THE_LOOP_GRAPHS', os.path.join(DATA_DIR, 'graphs'))
+FRAME_STATS = bool(os.environ.get('WALK_THE_LOOP_FRAME_STATS'))
 
 """
 Mapping of COLORS (UPPERCASE) and styles (lowercase) to rgb values.
@@ -0,0 +1,87 @@
+"""
+Discocube graphs of any order, built directly from the polycube construction.
+Level n is the octahedral polycube of the unit cubes centered on the odd lattice points (x, y, z) with
+|x| + |y| + |z| <= 2n + 1; cubes sharing a face are adjacent. Its order is 4n(n + 1)(n + 2) / 3:
+8 (the cube), 32 (DISCO), 80, 160, ...
+"""
+from functools import lru_cache
+
+import numpy as np
+
+from src.game.csr import csr_from_edges, node_index_dtype
+from src.game.graph import Graph
+
+
+def discocube_order(n) -> int:
+    """
+    Number of nodes of level n.
+    """
+    return 4 * n * (n + 1) * (n + 2) // 3
+
+
+def discocube_level(ORD) -> int:
+    """
+    Level of the discocube of order ORD, ValueError if there is none.
+    """
+    n = max(1, round((3 * ORD / 4) ** (1 / 3)) - 1)
+    while discocube_order(n) < ORD:
+        n += 1
+    if discocube_order(n) != ORD:
+        raise ValueError(f'no discocube has order {ORD}')
+    return n
+
+
+def discocube_points(n):
+    """
+    Centers of the cubes of level n, sorted by x, then y, then z.
+    """
+    axis = np.arange(-2 * n + 1, 2 * n, 2, dtype=np.int32)
+    points = np.stack(np.meshgrid(axis, axis, axis, indexing='ij'), axis=-1).reshape(-1, 3)
+    return points[np.abs(points).sum(axis=1) <= 2 * n + 1]
+
+
+def discocube_edges(n, points=None):
+    """
+    Edges between cubes of level n sharing a face, as an (m, 2) array of node ids.
+    """
+    points = discocube_points(n) if points is None else points
+    cells = (points + 2 * n - 1) // 2
+    ids = np.full((2 * n,) * 3, -1, dtype=node_index_dtype(len(points)))
+    ids[tuple(cells.T)] = np.arange(len(points))
+    pairs = []
+    for axis in range(3):
+        lower = ids[tuple(slice(None, -1) if a == axis else slice(None) for a in range(3))]
+        upper = ids[tuple(slice(1, None) if a == axis else slice(None) for a in range(3))]
+        both = (lower >= 0) & (upper >= 0)
+        pairs.append(np.stack((lower[both], upper[both]), axis=1))
+    return np.concatenate(pairs)
+
+
+@lru_cache(maxsize=8)
+def discocube(ORD) -> Graph:
+    """
+    Discocube graph of order ORD, with the cube centers as its 3d coordinates. Cached per order.
+    """
+    n = discocube_level(ORD)
+    points = discocube_points(n)
+    indptr, indices = csr_from_edges(discocube_edges(n, points), ORD)
+    return Graph(indptr, indices, coords=points.astype(np.float64))
+
+
+def layout_2d(coords, size=1000, margin=.2):
+    """
+    Isometric projection of 3d coordinates, scaled and centered into a size by size screen.
+    """
+    x, y, z = np.asarray(coords, dtype=np.float64).T
+    flat = np.stack(((x - y) * np.sqrt(3) / 2, (x + y) / 2 - z), axis=1)
+    flat -= (flat.max(axis=0) + flat.min(axis=0)) / 2
+    span = max(np.abs(flat).max(), 1)
+    return flat * (size * (1 - 2 * margin) / (2 * span)) + size / 2
+
+
+def discocube_board(ORD, size=1000):
+    """
+    Board of order ORD in the layout of defs.G_POLYHEDRA: 2d vertex positions 'V', adjacency 'A' and edges 'E'.
+    """
+    A = discocube(ORD)
+    return {'V': layout_2d(A.coords, size=size).tolist(), 'A': A, 'E': [tuple(e) for e in A.edges.tolist()]}
@@ -0,0 +1,71 @@
+"""
+Frame scheduler for the main loop: capped frame rate, blocking on the event queue when idle, frame-time stats.
+"""
+from collections import deque
+from time import perf_counter
+
+import pygame
+
+
+class FrameScheduler:
+    """
+    Paces a pygame loop so an open game does not spin a core.
+    events() waits up to idle_ms for input when the game is idle, end() sleeps off the rest of the frame so at most
+    fps frames run per second. The caller skips drawing on frames that changed nothing and says so to end().
+    window: number of recent frames the stats are taken over.
+    """
+    def __init__(self, fps=60, idle_ms=250, window=240):
+        self.fps = fps
+        self.idle_ms = idle_ms
+        self.clock = pygame.time.Clock()
+        self.frame_ms = deque(maxlen=window)
+        self.work_ms = deque(maxlen=window)
+        self.drawn = self.skipped = self.waits = 0
+        self.started = perf_counter()
+
+    def events(self, idle=False):
+        """
+        Pending events. When idle and none are pending, block until one arrives or idle_ms pass.
+        """
+        if idle and not pygame.event.peek():
+            self.waits += 1
+            event = pygame.event.wait(self.idle_ms)
+            self.started = perf_counter()
+            return ([] if event.type == pygame.NOEVENT else [event]) + pygame.event.get()
+        return pygame.event.get()
+
+    def end(self, drawn):
+        """
+        Close the frame: record its work time, then wait out the frame rate cap.
+        """
+        self.work_ms.append((perf_counter() - self.started) * 1e3)
+        if drawn:
+            self.drawn += 1
+        else:
+            self.skipped += 1
+        self.frame_ms.append(self.clock.tick(self.fps))
+        self.started = perf_counter()
+
+    def stats(self):
+        """
+        Frame rate, mean and worst frame time, mean, 95th percentile and worst work time (ms), frame counts.
+        """
+        work = sorted(self.work_ms) or [0]
+        frames = self.frame_ms or [0]
+        return {
+            'fps': self.clock.get_fps(),
+            'frame_ms': sum(frames) / len(frames),
+            'frame_max_ms': max(frames),
+            'work_ms': sum(work) / len(work),
+            'work_p95_ms': work[int(.95 * (len(work) - 1))],
+            'work_max_ms': work[-1],
+            'drawn': self.drawn,
+            'skipped': self.skipped,
+            'waits': self.waits,
+        }
+
+    def report(self):
+        """
+        Stats on one line.
+        """
+        return ', '.join(f'{key}: {value:.1f}' if isinstance(value, float) else f'{key}: {value}' for key, value in self.stats().items())
@@ -0,0 +1,241 @@
+"""
+Frozen, array-backed graph shared by the game pieces and the solvers.
+
+Graphs are saved in a versioned binary file: a header (magic, version, coordinate dimensions, index width, ORD,
+CSR entries, edges) followed by the arrays indptr, degrees, indices, edges, edge_slots and coordinates, each 64-byte
+aligned. Graph.load maps the file read-only instead of reading it, so opening is O(1) and worker processes share the pages.
+"""
+from collections import OrderedDict
+from collections.abc import Mapping
+import mmap
+from operator import index as as_index
+import struct
+
+import numpy as np
+
+from src.game.csr import csr_from_edges, grid_csr, node_index_dtype
+from src.game.parity import Parity
+from src.game.search import bit_adjacency
+
+BIT_MATRIX_MAX = 1 << 12
+MAGIC, VERSION = b'WTLG', 1
+HEADER = struct.Struct('<4sHHHHQQQ')
+ALIGN = 64
+
+
+def file_layout(dims, width, ORD, nnz, m):
+    """
+    (name, dtype, shape, offset) of every array of a graph file, and the file size.
+    """
+    index = np.dtype(f'<i{width}')
+    arrays = (('indptr', np.dtype('<i8'), (ORD + 1,)), ('degrees', index, (ORD,)), ('indices', index, (nnz,)),
+              ('edges', index, (m, 2)), ('edge_slots', np.dtype('<i8'), (nnz,)), ('coords', np.dtype('<f8'), (ORD, dims)))
+    layout, offset = [], HEADER.size
+    for name, dtype, shape in arrays:
+        offset = -(-offset // ALIGN) * ALIGN
+        layout.append((name, dtype, shape, offset))
+        offset += dtype.itemsize * int(np.prod(shape))
+    return layout, offset
+
+
+class Graph(Mapping):
+    """
+    Undirected graph over the integer nodes 0..ORD-1 in CSR form, read like an adjacency dict: A[node] -> frozenset.
+    Nodes are their own bit positions, as the solvers keeping bitmasks or arrays over node ids (Oracle, Hinter, Census,
+    SolutionStore) require of a board; Graph.position rejects anything else.
+    degrees: neighbors per node. edges: (m, 2) array, u < v, its row is the edge id. edge_slots: edge id of every CSR entry.
+    Boards up to BIT_MATRIX_MAX nodes also keep a bit matrix (masks, reused by search.bit_adjacency) and the neighbor sets,
+    so adjacency tests and lookups are O(1); larger graphs binary-search the sorted CSR rows.
+    coords: optional vertex coordinates, one row per node. source: the file a loaded graph is mapped from.
+    parity: the graph's Parity, colored on first use and kept, so every search on the graph shares one coloring pass.
+    The derived arrays (degrees, edges, edge_slots) are computed unless given, as when loading a file.
+    """
+    __slots__ = ('ORD', 'indptr', 'indices', 'degrees', 'edges', 'edge_slots', 'masks', 'sets', 'index', 'coords', 'source', 'colored')
+    cache, cache_size = OrderedDict(), 16
+
+    def __init__(self, indptr, indices, degrees=None, edges=None, edge_slots=None, coords=None, source=None):
+        ORD = len(indptr) - 1
+        indptr, indices = np.asarray(indptr, dtype=np.int64), np.asarray(indices)
+        if edges is None or edge_slots is None:
+            rows = np.repeat(np.arange(ORD, dtype=indices.dtype), np.diff(indptr))
+            upper = rows < indices
+            edges = np.stack((rows[upper], indices[upper]), axis=1)
+            edge_slots = np.empty(len(indices), dtype=np.int64)
+            edge_slots[upper] = np.arange(len(edges))
+            reverse = np.lexsort((rows[~upper], indices[~upper]))
+            edge_slots[np.flatnonzero(~upper)[reverse]] = np.arange(len(edges))
+        degrees = np.diff(indptr) if degrees is None else degrees
+        masks, sets, index = None, None, None
+        if ORD <= BIT_MATRIX_MAX:
+            bounds, flat = indptr.tolist(), indices.tolist()
+            sets = tuple(frozenset(flat[bounds[n]:bounds[n + 1]]) for n in range(ORD))
+            masks = tuple(sum(1 << m for m in s) for s in sets)
+            index = {n: n for n in range(ORD)}
+        values = ORD, indptr, indices, degrees, edges, edge_slots, masks, sets, index, coords, source, None
+        for name, value in zip(self.__slots__, values):
+            object.__setattr__(self, name, value)
+        for array in (indptr, indices, degrees, edges, edge_slots, coords):
+            if array is not None:
+                array.flags.writeable = False
+
+    @classmethod
+    def load(cls, filename):
+        """
+        Map a graph file.
+        """
+        with open(filename, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, dims, width, _, ORD, nnz, m = HEADER.unpack_from(buffer)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f'{filename} is not a version {VERSION} graph file')
+        layout, size = file_layout(dims, width, ORD, nnz, m)
+        if len(buffer) < size:
+            raise ValueError(f'{filename} is truncated')
+        arrays = {name: np.frombuffer(buffer, dtype=dtype, count=int(np.prod(shape)), offset=offset).reshape(shape)
+                  for name, dtype, shape, offset in layout}
+        return cls(arrays['indptr'], arrays['indices'], degrees=arrays['degrees'], edges=arrays['edges'],
+                   edge_slots=arrays['edge_slots'], coords=arrays['coords'] if dims else None, source=filename)
+
+    def save(self, filename, coords=None):
+        """
+        Write the graph file, with coords (or the graph's own coordinates) as the vertex coordinates.
+        """
+        coords = self.coords if coords is None else np.asarray(coords, dtype=np.float64).reshape(self.ORD, -1)
+        dims = 0 if coords is None else coords.shape[1]
+        width = np.dtype(node_index_dtype(self.ORD)).itemsize
+        layout, size = file_layout(dims, width, self.ORD, len(self.indices), len(self.edges))
+        arrays = {'indptr': self.indptr, 'degrees': self.degrees, 'indices': self.indices, 'edges': self.edges,
+                  'edge_slots': self.edge_slots, 'coords': coords}
+        with open(filename, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, dims, width, 0, self.ORD, len(self.indices), len(self.edges)))
+            for name, dtype, shape, offset in layout:
+                if arrays[name] is not None:
+                    f.seek(offset)
+                    f.write(np.ascontiguousarray(arrays[name], dtype=dtype).tobytes())
+            f.truncate(size)
+
+    @classmethod
+    def of(cls, A):
+        """
+        Graph of an adjacency dict, built once per dict; graphs (and None) pass through.
+        The graphs of the cache_size most recently used dicts are kept. An entry holds its dict, so the id it is keyed
+        on cannot be reused by another dict while the entry lives.
+        """
+        if A is None or isinstance(A, Graph):
+            return A
+        if (cached := cls.cache.get(id(A))) is not None:
+            cls.cache.move_to_end(id(A))
+            return cached[1]
+        cached = cls.cache[id(A)] = A, cls.from_adjacency(A)
+        if len(cls.cache) > cls.cache_size:
+            cls.cache.popitem(last=False)
+        return cached[1]
+
+    @classmethod
+    def from_adjacency(cls, A):
+        """
+        Graph of an adjacency dict over the nodes 0..ORD-1.
+        """
+        edges = [(u, v) for u in A for v in A[u] if u < v]
+        return cls.from_edges(edges, len(A))
+
+    @classmethod
+    def from_edges(cls, edges, ORD):
+        """
+        Graph of an edge list over the nodes 0..ORD-1.
+        """
+        return cls(*csr_from_edges(edges, ORD))
+
+    @classmethod
+    def grid(cls, x, y, z=None):
+        """
+        Graph of a 2d grid, or a 3d grid when z is given.
+        """
+        indptr, indices, _, _ = grid_csr(x, y, z)
+        return cls(indptr, indices)
+
+    @property
+    def parity(self):
+        """
+        Parity of the graph, computed once.
+        """
+        if self.colored is None:
+            object.__setattr__(self, 'colored', Parity(bit_adjacency(self)[2]))
+        return self.colored
+
+    def position(self, node) -> int:
+        """
+        Node as an int, KeyError if it is not a node of the graph.
+        """
+        try:
+            node = as_index(node)
+        except TypeError:
+            raise KeyError(node) from None
+        if not 0 <= node < self.ORD:
+            raise KeyError(node)
+        return node
+
+    def neighbors(self, node):
+        """
+        Sorted neighbors of node as a read-only array.
+        """
+        node = self.position(node)
+        return self.indices[self.indptr[node]:self.indptr[node + 1]]
+
+    def degree(self, node) -> int:
+        """
+        Number of neighbors of node.
+        """
+        return int(self.degrees[self.position(node)])
+
+    def slot(self, u, v):
+        """
+        CSR position of v in the row of u, None if they are not adjacent.
+        """
+        row = self.neighbors(u)
+        at = int(np.searchsorted(row, v))
+        return self.indptr[u] + at if at < len(row) and row[at] == v else None
+
+    def adjacent(self, u, v) -> bool:
+        """
+        If u and v share an edge.
+        """
+        if self.masks is not None:
+            return 0 <= (v := as_index(v)) < self.ORD and bool(self.masks[self.position(u)] >> v & 1)
+        return self.slot(u, v) is not None
+
+    def edge_id(self, u, v):
+        """
+        Row of edge (u, v) in edges, None if they are not adjacent.
+        """
+        return None if (at := self.slot(u, v)) is None else int(self.edge_slots[at])
+
+    def __getitem__(self, node):
+        if self.sets is not None:
+            return self.sets[self.position(node)]
+        return frozenset(self.neighbors(node).tolist())
+
+    def __contains__(self, node):
+        try:
+            self.position(node)
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self):
+        return iter(range(self.ORD))
+
+    def __len__(self):
+        return self.ORD
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'{type(self).__name__} is frozen')
+
+    def __reduce__(self):
+        if self.source is not None:
+            return type(self).load, (self.source,)
+        coords = None if self.coords is None else np.array(self.coords)
+        return type(self), (np.array(self.indptr), np.array(self.indices), None, None, None, coords)
+
+    def __repr__(self):
+        return f'Graph(ORD={self.ORD}, edges={len(self.edges)})'
@@ -0,0 +1,157 @@
+"""
+Held-Karp style dynamic programming over (visited bitmask, head) states.
+Counts hamiltonian cycles exactly and enumerates them lazily, for boards up to ~40 nodes.
+
+Paths grow from the origin (bit 0) one layer per step, but only up to half the board:
+a directed cycle splits at the head h of its first half S into a path 0 -> h covering S
+and a path 0 -> h covering the rest of the board plus 0 and h, which is a state of the same (or next) layer.
+"""
+from math import factorial
+import numpy as np
+
+from src.game.parity import Parity
+from src.game.search import bit_adjacency, bits
+
+HEAD_BITS = 6
+
+
+class CycleDP:
+    """
+    Layered DP table: per layer a sorted uint64 array of keys (mask << 6 | head) and an array of path counts.
+    max_bytes caps the memory held by the layers, a layer that would exceed it raises MemoryError.
+    keep: hold every layer, needed to enumerate cycles.
+    parity: Parity of A, the one a Graph keeps.
+    """
+    def __init__(self, A, max_bytes=1 << 30, keep=False):
+        self.nodes, self.index, masks = bit_adjacency(A)
+        self.ORD = len(self.nodes)
+        if self.ORD > 64 - HEAD_BITS:
+            raise ValueError(f'{self.ORD} nodes do not fit a {64 - HEAD_BITS} bit mask')
+        self.nbr = np.array(masks, dtype=np.uint64)
+        self.parity = Parity.of(A)
+        self.max_bytes = max_bytes
+        self.keep = keep
+        self.half = (self.ORD + 2) // 2
+        self.other = self.ORD + 2 - self.half
+        self.dtype = np.uint64 if factorial(max(self.other - 2, 0)) < 1 << 64 else object
+        self.layers = {}
+        self.nbytes = 0
+
+    def build(self):
+        """
+        Grow the layers from the origin up to the half layers.
+        """
+        if self.layers:
+            return self
+        keys, counts = np.array([1 << HEAD_BITS], dtype=np.uint64), np.ones(1, dtype=self.dtype)
+        for size in range(1, self.other + 1):
+            if size > 1:
+                keys, counts = self.expand(keys, counts)
+            if self.keep or size in (self.half, self.other):
+                self.layers[size] = keys, counts
+                self.nbytes += keys.nbytes + counts.nbytes
+        return self
+
+    def expand(self, keys, counts):
+        """
+        Next layer: step every state to each unvisited neighbor of its head, summing counts of equal states.
+        """
+        masks, heads = keys >> np.uint64(HEAD_BITS), (keys & np.uint64((1 << HEAD_BITS) - 1)).astype(np.intp)
+        cand = self.nbr[heads] & ~masks
+        new_keys, new_counts, width = [], [], 0
+        for j in range(1, self.ORD):
+            if len(sel := np.flatnonzero(cand & np.uint64(1 << j))):
+                if self.nbytes + 3 * (width := width + len(sel)) * (8 + counts.itemsize) > self.max_bytes:
+                    raise MemoryError(f'DP layer of {width}+ states exceeds {self.max_bytes} bytes')
+                new_keys.append((masks[sel] | np.uint64(1 << j)) << np.uint64(HEAD_BITS) | np.uint64(j))
+                new_counts.append(counts[sel])
+        if not new_keys:
+            return np.empty(0, dtype=np.uint64), np.empty(0, dtype=self.dtype)
+        keys, counts = np.concatenate(new_keys), np.concatenate(new_counts)
+        order = np.argsort(keys, kind='stable')
+        keys, counts = keys[order], counts[order]
+        starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+        return keys[starts], np.add.reduceat(counts, starts)
+
+    def lookup(self, size, keys):
+        """
+        Counts of the given keys in layer size, zero where a state is absent.
+        """
+        layer_keys, layer_counts = self.layers[size]
+        found = np.zeros(len(keys), dtype=self.dtype)
+        if len(layer_keys):
+            pos = np.minimum(np.searchsorted(layer_keys, keys), len(layer_keys) - 1)
+            hit = layer_keys[pos] == keys
+            found[hit] = layer_counts[pos[hit]]
+        return found
+
+    def pairs(self):
+        """
+        States of the first half layer with the key of their matching second half.
+        """
+        keys, counts = self.build().layers[self.half]
+        masks, heads = keys >> np.uint64(HEAD_BITS), keys & np.uint64((1 << HEAD_BITS) - 1)
+        full = np.uint64((1 << self.ORD) - 1)
+        rest = (full & ~masks) | np.uint64(1) | (np.uint64(1) << heads)
+        keep = heads != 0
+        return keys[keep], counts[keep], (rest << np.uint64(HEAD_BITS) | heads)[keep]
+
+    def count(self) -> int:
+        """
+        Number of (undirected) hamiltonian cycles.
+        """
+        if self.ORD < 3 or not self.parity.cycle_possible:
+            return 0
+        keys, counts, others = self.pairs()
+        matched = self.lookup(self.other, others)
+        hit = matched > 0
+        return int(np.dot(counts[hit].astype(object), matched[hit].astype(object))) // 2
+
+    def paths(self, size, mask, head):
+        """
+        Lazily enumerate the paths from the origin to head covering mask, as bit positions.
+        """
+        if size == 1:
+            yield [head]
+            return
+        prev = mask & ~(1 << head)
+        keys, counts = self.layers[size - 1]
+        for g in bits(self.nbr[head].item() & prev):
+            key = np.uint64(prev << HEAD_BITS | g)
+            pos = np.searchsorted(keys, key)
+            if pos < len(keys) and keys[pos] == key:
+                for path in self.paths(size - 1, prev, g):
+                    path.append(head)
+                    yield path
+
+    def cycles(self):
+        """
+        Lazily enumerate the hamiltonian cycles from the origin, each undirected cycle once.
+        """
+        if not self.keep:
+            raise ValueError('enumerating cycles needs CycleDP(keep=True)')
+        if self.ORD < 3:
+            return
+        keys, counts, others = self.pairs()
+        matched = self.lookup(self.other, others)
+        for key, other in zip(keys[matched > 0].tolist(), others[matched > 0].tolist()):
+            head = key & (1 << HEAD_BITS) - 1
+            for first in self.paths(self.half, key >> HEAD_BITS, head):
+                for second in self.paths(self.other, other >> HEAD_BITS, head):
+                    cycle = first + second[-2:0:-1]
+                    if cycle[1] < cycle[-1]:
+                        yield [self.nodes[p] for p in cycle]
+
+
+def count_cycles(A, max_bytes=1 << 30) -> int:
+    """
+    Exact number of hamiltonian cycles of adjacency A.
+    """
+    return CycleDP(A, max_bytes=max_bytes).count()
+
+
+def iter_cycles(A, max_bytes=1 << 30):
+    """
+    Lazily enumerate the hamiltonian cycles of adjacency A, keyed to its first node.
+    """
+    yield from CycleDP(A, max_bytes=max_bytes, keep=True).build().cycles()
@@ -0,0 +1,82 @@
+"""
+Anytime hint engine: the best next step from the head of a path within a hard latency budget.
+"""
+from time import perf_counter
+
+from src.game.ordering import Warnsdorff
+from src.game.parity import Parity
+from src.game.pruning import DeadEnds
+from src.game.search import BitSearch, bit_adjacency, bits
+
+
+class Hinter:
+    """
+    One search per candidate step, advanced round robin in slices of moves until the deadline.
+    A candidate is scored (closes a cycle, not yet refuted, deepest path reached, fewest onward moves), so an
+    answer is ready at any time and only improves with the budget.
+    Paths are read as bit positions, see Graph for the numbering.
+    store: SolutionStore consulted first, a stored completion answers at once.
+    table: TranspositionTable shared by the searches.
+    The parity, move ordering and pruners are made once, so the deadline is not spent building each search, and a
+    candidate only gets the incremental pruning check of its step, never a pass over the whole board.
+    """
+    def __init__(self, A, store=None, slice_moves=64, seed=0, table=None):
+        self.adjacency = bit_adjacency(A)
+        self.masks = self.adjacency[2]
+        self.parity = Parity.of(A)
+        self.move = Warnsdorff(seed=seed).bind(len(self.masks))
+        self.pruners = {}
+        self.store = store
+        self.table = table.bind(len(self.masks)) if table is not None else None
+        self.slice_moves = slice_moves
+        self.seed = seed
+        self.scores = {}
+
+    def pruner(self, origin):
+        """
+        Pruner of the cycles closing on origin, made once per origin.
+        """
+        if (pruner := self.pruners.get(origin)) is None:
+            pruner = self.pruners[origin] = DeadEnds(self.masks, origin, self.parity)
+        return pruner
+
+    def hint(self, path, budget_ms=50):
+        """
+        Best next step after path[-1], None if the head is stuck.
+        """
+        deadline = perf_counter() + budget_ms / 1000
+        visited = 0
+        for n in path:
+            visited |= 1 << n
+        cand = list(bits(self.masks[path[-1]] & ~visited))
+        if not cand:
+            return None
+        if self.store is not None and (completion := self.store.complete(path)) is not None and len(completion) > len(path):
+            return completion[len(path)]
+        free = ~visited
+        self.scores = {p: [False, True, len(path) + 1, -(self.masks[p] & free).bit_count()] for p in cand}
+        searches, pruner = {}, self.pruner(path[0])
+        for p in cand:
+            if perf_counter() >= deadline:
+                break
+            search = BitSearch(None, start=list(path) + [p], origin=path[0], adjacency=self.adjacency, pruner=pruner, move=self.move,
+                               table=self.table)
+            search.dead = pruner.doomed(search.path, search.visited)
+            searches[p] = search, search.walker()
+        while searches and perf_counter() < deadline:
+            for p, (search, steps) in list(searches.items()):
+                score = self.scores[p]
+                try:
+                    for _ in range(self.slice_moves):
+                        score[2] = max(score[2], len(next(steps)))
+                        if search.stats.cycles:
+                            score[0] = True
+                            return p
+                        if perf_counter() >= deadline:
+                            break
+                except StopIteration:
+                    score[1] = False
+                    del searches[p]
+                if perf_counter() >= deadline:
+                    break
+        return max(self.scores, key=lambda p: self.scores[p])
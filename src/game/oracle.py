@@ -0,0 +1,70 @@
+"""
+Feasibility oracle: can a partial path still be extended to a hamiltonian cycle?
+"""
+from time import perf_counter
+
+from src.game.ordering import Warnsdorff
+from src.game.parity import Parity
+from src.game.pruning import DeadEnds
+from src.game.search import BitSearch, bit_adjacency
+
+
+class Oracle:
+    """
+    A memoized bounded search, not an O(1) lookup: the first question about a state runs a search of up to
+    budget_ms, answers are memoized on (head, origin, visited bitmask), so replaying a position costs a dict lookup.
+    Visited masks use the node ids as bit positions, so A is numbered like a Graph.
+    store: SolutionStore consulted before searching.
+    budget_ms: time a search may take before giving up, an undecided state counts as solvable. The deadline is polled
+    every 64 expansions on boards under poll_order nodes and after every expansion on larger ones, where a single pruned
+    expansion can take a millisecond.
+    table: TranspositionTable shared by the searches, refuted states carry over between questions.
+    """
+    poll_order = 256
+
+    def __init__(self, A, store=None, budget_ms=20, memo_size=1 << 16, table=None):
+        self.adjacency = bit_adjacency(A)
+        self.masks = self.adjacency[2]
+        self.full = (1 << len(self.masks)) - 1
+        self.parity = Parity.of(A)
+        self.store = store
+        self.table = table
+        self.budget_ms = budget_ms
+        self.poll = 0x3F if len(self.masks) < self.poll_order else 0
+        self.memo_size = memo_size
+        self.memo = {}
+
+    def solvable(self, path, visited) -> bool:
+        """
+        If path, covering the nodes of the visited mask, can still close into a hamiltonian cycle.
+        """
+        if not len(path):
+            return True
+        key = path[-1], path[0], visited
+        if (known := self.memo.get(key)) is None:
+            if len(self.memo) >= self.memo_size:
+                self.memo.clear()
+            known = self.memo[key] = self.decide(path, visited)
+        return known
+
+    def decide(self, path, visited) -> bool:
+        """
+        Settle a state: closed loop, parity, stored completion, pruning, then a search of up to budget_ms.
+        """
+        deadline = perf_counter() + self.budget_ms / 1000
+        head, origin = path[-1], path[0]
+        if visited == self.full:
+            return len(path) > 2 and bool(self.masks[head] >> origin & 1)
+        if not self.parity.completable(head, origin, visited):
+            return False
+        if self.store is not None and self.store.complete(path) is not None:
+            return True
+        start = (origin, head) if head != origin else (origin,)
+        search = BitSearch(None, start=start, adjacency=self.adjacency, pruner=DeadEnds, move=Warnsdorff(seed=0), table=self.table,
+                           parity=self.parity)
+        search.visited = visited
+        search.halt = lambda: perf_counter() >= deadline
+        search.poll = self.poll
+        for _ in search.walker(trace=False):
+            return True
+        return search.halted
@@ -0,0 +1,73 @@
+"""
+Move ordering for the bitset walkers: which candidate step is tried next.
+Each ordering is bound to a board once, then picks a bit position out of a candidate mask.
+"""
+from random import Random
+
+from src.game.search import bits
+
+
+class FirstMove:
+    """
+    Lowest bit position first, i.e. node order.
+    """
+    def bind(self, ORD):
+        """
+        Nothing to prepare.
+        """
+        return self
+
+    def pick(self, cand, visited, masks):  # noqa
+        """
+        Lowest set bit of cand.
+        """
+        return (cand & -cand).bit_length() - 1
+
+
+class RandomMove:
+    """
+    Random order: every node gets a random rank, seedable for reproducible walks.
+    """
+    def __init__(self, seed=None):
+        self.random = Random(seed)
+        self.rank = None
+
+    def bind(self, ORD):
+        """
+        Draw the ranks for a board of ORD nodes, once: searches sharing the ordering share the ranks.
+        """
+        if self.rank is None or len(self.rank) != ORD:
+            self.rank = self.random.sample(range(ORD), ORD)
+        return self
+
+    def pick(self, cand, visited, masks):  # noqa
+        """
+        Candidate with the lowest rank.
+        """
+        return min(bits(cand), key=self.rank.__getitem__)
+
+
+class Warnsdorff(RandomMove):
+    """
+    Fewest onward moves first, ties broken by the seeded random rank.
+    """
+    def pick(self, cand, visited, masks):
+        """
+        Candidate with the fewest unvisited neighbors.
+        """
+        free, rank = ~visited, self.rank
+        return min(bits(cand), key=lambda p: ((masks[p] & free).bit_count(), rank[p]))
+
+
+MOVE_ORDERS = {'first': FirstMove, 'random': RandomMove, 'warnsdorff': Warnsdorff}
+
+
+def move_order(order=None, seed=None):
+    """
+    Get a move ordering by name ('first', 'random', 'warnsdorff'), or pass an ordering object through.
+    """
+    if order is None:
+        return None
+    if isinstance(order, str):
+        return FirstMove() if order == 'first' else MOVE_ORDERS[order](seed=seed)
+    return order
@@ -0,0 +1,159 @@
+"""
+Process-pool solver: splits the search tree by path prefixes from the origin and walks the subtrees in parallel.
+"""
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import multiprocessing
+import os
+from random import Random
+
+from src.game.ordering import move_order
+from src.game.parity import Parity
+from src.game.pruning import DeadEnds
+from src.game.search import BitSearch, bit_adjacency, bits
+
+_board, _parity, _cancel = None, None, None
+
+
+def path_prefixes(A, depth, feasible=True):
+    """
+    All paths of depth steps from the first node of A, skipping those that can no longer close a cycle.
+    """
+    nodes, index, masks = bit_adjacency(A)
+    pruner = DeadEnds(masks, 0) if feasible else None
+
+    def grow(path, visited):
+        """
+        Extend path one step at a time up to depth.
+        """
+        if len(path) > depth:
+            yield [nodes[p] for p in path]
+            return
+        for p in bits(masks[path[-1]] & ~visited):
+            path.append(p)
+            if pruner is None or not pruner.doomed(path, visited | 1 << p):
+                yield from grow(path, visited | 1 << p)
+            path.pop()
+
+    if pruner is None or not pruner.check([0], 1):
+        yield from grow([0], 1)
+
+
+def init_worker(A, cancel):
+    """
+    Keep the board, its parity (colored once per worker) and the shared cancel event in the worker process.
+    """
+    global _board, _parity, _cancel
+    _board, _parity, _cancel = A, Parity.of(A), cancel
+
+
+def solve_prefix(prefix, first=False, collect=False, sample=0, seed=None, order=None, feasible=True):
+    """
+    Walk the subtree of prefix in a worker.
+    :return: number of directed cycles found, and the cycles (each undirected cycle once) or a reservoir sample of them.
+    """
+    if _cancel.is_set():
+        return 0, 0, []
+    search = BitSearch(_board, start=prefix, move=move_order(order, seed=seed), pruner=DeadEnds if feasible else None,
+                       parity=_parity)
+    search.halt = _cancel.is_set
+    rng = Random(seed)
+    found, kept, cycles = 0, 0, []
+    for cycle in search.walker(trace=False):
+        found += 1
+        if first:
+            return found, 1, [cycle[:]]
+        if search.path[1] > search.path[-1]:
+            continue
+        kept += 1
+        if collect:
+            cycles.append(cycle[:])
+        elif len(cycles) < sample:
+            cycles.append(cycle[:])
+        elif sample and (slot := rng.randrange(kept)) < sample:
+            cycles[slot] = cycle[:]
+    return found, kept, cycles
+
+
+class PoolSolver:
+    """
+    Hamiltonian cycles of a board on a ProcessPoolExecutor.
+    The search tree is split into the paths of depth steps from the origin, one task each.
+    depth: prefix length, by default the shortest giving 8 tasks per worker.
+    """
+    def __init__(self, A, depth=None, workers=None, order='warnsdorff', feasible=True, seed=None):
+        self.A = A
+        self.ORD = len(A)
+        self.workers = workers or os.cpu_count()
+        self.order = order
+        self.feasible = feasible
+        self.seed = seed
+        self.depth = depth
+        if self.depth is None:
+            self.depth = 1
+            while self.depth < self.ORD - 2 and len(self.prefixes()) < 8 * self.workers:
+                self.depth += 1
+        self.depth = max(1, min(self.depth, self.ORD - 2))
+
+    def prefixes(self):
+        """
+        Path prefixes handed to the workers.
+        """
+        return list(path_prefixes(self.A, self.depth, feasible=self.feasible))
+
+    def results(self, **kwargs):
+        """
+        Yield (found, kept, cycles) of every prefix as the workers finish.
+        Closing the generator cancels pending prefixes and signals running ones to stop.
+        """
+        cancel = multiprocessing.get_context().Event()
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=init_worker, initargs=(self.A, cancel)) as pool:
+            futures = [
+                pool.submit(solve_prefix, prefix, order=self.order, feasible=self.feasible, seed=None if self.seed is None else self.seed + i, **kwargs)
+                for i, prefix in enumerate(self.prefixes())
+            ]
+            try:
+                for future in as_completed(futures):
+                    yield future.result()
+            finally:
+                cancel.set()
+                for future in futures:
+                    future.cancel()
+
+    def first(self):
+        """
+        First hamiltonian cycle found by any worker, the others are cancelled.
+        """
+        for found, kept, cycles in self.results(first=True):
+            if cycles:
+                return cycles[0]
+        return None
+
+    def count(self) -> int:
+        """
+        Number of (undirected) hamiltonian cycles.
+        """
+        return sum(kept for found, kept, cycles in self.results())
+
+    def cycles(self):
+        """
+        Every hamiltonian cycle once, merged from the workers as they finish.
+        """
+        for found, kept, cycles in self.results(collect=True):
+            yield from cycles
+
+    def sample(self, k, seed=None):
+        """
+        Uniform sample of k hamiltonian cycles, merged from the reservoir samples of the workers.
+        :return: number of cycles, sample.
+        """
+        rng = Random(seed)
+        total, chosen = 0, []
+        for found, kept, cycles in self.results(sample=k):
+            rng.shuffle(cycles)
+            merged, pools = [], [[total, chosen], [kept, cycles]]
+            for _ in range(min(k, total + kept)):
+                side = pools[0] if rng.randrange(pools[0][0] + pools[1][0]) < pools[0][0] else pools[1]
+                side[0] -= 1
+                merged.append(side[1].pop())
+            total, chosen = total + kept, merged
+        return total, chosen
@@ -0,0 +1,112 @@
+"""
+Bipartite parity analysis: settles in linear time what a search would take minutes to prove.
+A path on a bipartite board alternates colors, so the color counts of the nodes left to visit fix how it can end:
+unequal color classes rule out any hamiltonian cycle, and a partial path can only be completed if the unvisited
+nodes split between the colors as the alternation demands.
+"""
+from src.game.search import bit_adjacency, bits
+
+
+def two_coloring(masks):
+    """
+    Breadth-first 2-coloring over bitmask adjacency, each component from its lowest node.
+    :return: bitmasks of the two color classes, None if the graph is not bipartite.
+    """
+    sides, seen = [0, 0], 0
+    for root in range(len(masks)):
+        if seen >> root & 1:
+            continue
+        frontier, side = 1 << root, 0
+        while frontier:
+            seen |= frontier
+            sides[side] |= frontier
+            grown = 0
+            for p in bits(frontier):
+                grown |= masks[p]
+            if grown & sides[side]:
+                return None
+            frontier, side = grown & ~seen, side ^ 1
+    return tuple(sides)
+
+
+class Parity:
+    """
+    Color classes of a board, computed once, and the parity tests built on them.
+    Every test passes on a board that is not bipartite, since parity says nothing there.
+    """
+    def __init__(self, masks):
+        self.ORD = len(masks)
+        self.full = (1 << self.ORD) - 1
+        self.sides = two_coloring(masks)
+        self.bipartite = self.sides is not None
+        self.counts = tuple(side.bit_count() for side in self.sides) if self.bipartite else None
+
+    @classmethod
+    def of(cls, A):
+        """
+        Parity of an adjacency, nodes taken as bit positions in sorted order. A Graph hands over its own.
+        """
+        if (parity := getattr(A, 'parity', None)) is not None:
+            return parity
+        return cls(bit_adjacency(A)[2])
+
+    def side(self, node) -> int:
+        """
+        Color class of node.
+        """
+        return self.sides[1] >> node & 1
+
+    @property
+    def cycle_possible(self) -> bool:
+        """
+        A bipartite board needs equal color classes to have a hamiltonian cycle.
+        """
+        return not self.bipartite or self.counts[0] == self.counts[1]
+
+    def split(self, head, visited):
+        """
+        Unvisited nodes of the color of head and of the other color.
+        """
+        free = self.full & ~visited
+        same = (free & self.sides[self.side(head)]).bit_count()
+        return same, free.bit_count() - same
+
+    def completable(self, head, origin, visited) -> bool:
+        """
+        If a path ending on head can pass every unvisited node and close on origin as far as parity goes.
+        The k unvisited nodes alternate from the color opposite head, so ceil(k / 2) of them have the other color
+        and origin, right after the last of them, has the color of head exactly when k is odd.
+        """
+        if not self.bipartite:
+            return True
+        same, other = self.split(head, visited)
+        k = same + other
+        return other == (k + 1) // 2 and (self.side(head) == self.side(origin)) == bool(k & 1)
+
+    def snake_completable(self, head, visited, end=None) -> bool:
+        """
+        If a path ending on head can pass every unvisited node, finishing on end if given, as far as parity goes.
+        """
+        if not self.bipartite:
+            return True
+        same, other = self.split(head, visited)
+        k = same + other
+        if other != (k + 1) // 2:
+            return False
+        return end is None or (self.side(end) != self.side(head)) == bool(k & 1)
+
+    def snake_possible(self, start, end=None) -> bool:
+        """
+        If a hamiltonian path can run from start (to end) as far as parity goes.
+        """
+        return self.snake_completable(start, 1 << start, end)
+
+    def starts(self, snake=False) -> int:
+        """
+        Bitmask of the nodes a hamiltonian cycle, or path if snake, can start from as far as parity goes.
+        """
+        if not self.bipartite:
+            return self.full
+        if not snake:
+            return self.full if self.cycle_possible else 0
+        return sum(1 << n for n in range(self.ORD) if self.snake_possible(n))
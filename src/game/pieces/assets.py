@@ -0,0 +1,71 @@
+"""
+Process-wide cache of the images in ICONS_DIR: each file is read from disk once, each scaled variant made once.
+Also the fonts, looked up once, and the rendered node labels, in an LRU cache so large boards stay bounded.
+"""
+from collections import OrderedDict
+import os
+import pygame
+
+from src.game.defs import ICONS_DIR
+
+images, variants, converted = {}, {}, set()
+fonts, labels = {}, OrderedDict()
+label_cap = 4096
+
+
+def image(name, state=''):
+    """
+    Image of the file {name}{state}.png, converted to the display format (with alpha) once a display is set.
+    state: the file suffix of the icon's state, e.g. '1' for the current board or '_0' for play.
+    """
+    stem = f'{name}{state}'
+    if (surface := images.get(stem)) is None:
+        surface = images[stem] = pygame.image.load(os.path.join(ICONS_DIR, f'{stem}.png'))
+    if stem not in converted and pygame.display.get_surface() is not None:
+        surface = images[stem] = surface.convert_alpha()
+        converted.add(stem)
+    return surface
+
+
+def scaled(name, state='', size=(100, 100)):
+    """
+    Image scaled to size, made once per (name, state, size). Shared: copy it before drawing on it.
+    """
+    size = tuple(int(p) for p in size)
+    key = name, state, size
+    if (surface := variants.get(key)) is None:
+        surface = variants[key] = pygame.transform.scale(image(name, state), size)
+    return surface
+
+
+def font(name='Oswald', size=16):
+    """
+    System font, looked up once per (name, size).
+    """
+    if (found := fonts.get((name, size))) is None:
+        found = fonts[name, size] = pygame.font.SysFont(name, size)
+    return found
+
+
+def label(text, size=16, color=(255, 0, 255), name='Oswald'):
+    """
+    Rendered text, kept for the label_cap most recently used (text, size, color, font). Shared: do not draw on it.
+    """
+    key = text, size, color, name
+    if (surface := labels.get(key)) is not None:
+        labels.move_to_end(key)
+        return surface
+    surface = labels[key] = font(name, size).render(text, True, color)
+    if len(labels) > label_cap:
+        labels.popitem(last=False)
+    return surface
+
+
+def preload():
+    """
+    Read every image of ICONS_DIR, so the first frame does not wait on the disk.
+    """
+    for filename in sorted(os.listdir(ICONS_DIR)):
+        if filename.endswith('.png'):
+            image(filename[:-4])
+    return len(images)
@@ -42,6 +42,9 @@ class Point:
 class Edge(pygame.sprite.Sprite):
     """
     Edge class.
+    Unless drawn on a shared surface, an edge owns a surface just covering its segment, positioned by rect, so memory
+    and blitting scale with the length of the edge and not the screen; pm and pn are then relative to that surface.
+    The segment is only redrawn when its color changes.
     """
     def __init__(self, scale=1, thickness=6, style='inactive', group=None, data=None, pm=None, pn=None, player_id=0, screen_rect=None, surface=None):
         super(Edge, self).__init__(group)
@@ -55,28 +58,51 @@ class Edge(pygame.sprite.Sprite):
         self.style = style
         self.group = group
         self.data = data
-        self.surface = surface or pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        self.rect = self.surface.get_rect()
-        pygame.draw.aaline(self.surface, COLORS[self.style], self.pm, self.pn)
+        self.shared = surface is not None
+        if self.shared:
+            self.surface = surface
+            self.rect = self.surface.get_rect()
+        else:
+            self.rect = self.bounds(self.pm, self.pn, max(self.thickness, 3))
+            self.pm, self.pn = [(x - self.rect.x, y - self.rect.y) for x, y in (self.pm, self.pn)]
+            self.surface = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        self.color = COLORS[self.style]
+        pygame.draw.aaline(self.surface, self.color, self.pm, self.pn)
+
+    @staticmethod
+    def bounds(pm, pn, pad):
+        """
+        Rect around the segment pm-pn with pad pixels to spare on every side.
+        """
+        left, top = int(min(pm[0], pn[0])) - pad, int(min(pm[1], pn[1])) - pad
+        right, bottom = int(max(pm[0], pn[0])) + pad + 1, int(max(pm[1], pn[1])) + pad + 1
+        return pygame.Rect(left, top, right - left, bottom - top)
 
     def set_color(self, style='inactive'):
         """
-        Change color based on style.
+        Change color based on style, redrawing only if the color changed.
         """
         self.style = style
-        self.thickness = self.thickness
+        color = COLORS[f'active_{self.player_id}' if self.style == 'active' else self.style]
+        if color == self.color and not self.shared:
+            return
         self.draw_black_line()
+        self.color = color
         pygame.draw.aaline(
             surface=self.surface,
-            color=COLORS[f'active_{self.player_id}' if self.style == 'active' else self.style],
+            color=self.color,
             start_pos=self.pm,
             end_pos=self.pn,
         )
 
     def draw_black_line(self, thickness=3):
         """
-        Change color based on style.
+        Erase the segment: cleared if the surface is the edge's own, painted black if shared.
         """
+        self.color = None
+        if not self.shared:
+            self.surface.fill((0, 0, 0, 0))
+            return
         pygame.draw.line(
             surface=self.surface,
             color=COLORS['BLACK'],
@@ -90,6 +116,7 @@ class Edge(pygame.sprite.Sprite):
         Draw multiple lines.
         """
         self.style = style
+        self.color = None
         pygame.draw.aalines(
             surface=self.surface,
             color=COLORS[f'active_{self.player_id}' if self.style == 'active' else self.style],
@@ -105,6 +132,7 @@ class Edge(pygame.sprite.Sprite):
         target = Point(self.pn) if origin_node == self.data[0] else Point(self.pm)
         slope = (displacement := target - origin) / (length := len(displacement))
         dash_length = int(length / 100) or 1
+        self.color = None
 
         for index in range(0, length // dash_length):
             start = origin + (slope * index * dash_length)
@@ -123,6 +151,7 @@ class Edge(pygame.sprite.Sprite):
         origin = Point(self.pm) if origin_node == self.data[0] else Point(self.pn)
         target = Point(self.pn) if origin_node == self.data[0] else Point(self.pm)
         slope = (displacement := target - origin) / (length := len(displacement))
+        self.color = None
         for index in range(0, length // dash_length, 2):
             start = origin + (slope * index * dash_length)
             end = origin + (slope * (index + 1) * dash_length)
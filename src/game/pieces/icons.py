@@ -1,10 +1,10 @@
 """
 Icons for game. Not game pieces.
 """
-import os
 import pygame
 
-from src.game.defs import ICONS_DIR, COLORS, G_POLYHEDRA
+from src.game.defs import COLORS, G_POLYHEDRA
+from src.game.pieces import assets
 from src.game.pieces.edge import Edge
 from src.game.utils import scale_point
 
@@ -27,6 +27,7 @@ class DrawnIcon(pygame.sprite.Sprite):
         self.V = [[(v / 10) * self.scale for v in vector] for vector in self.graph['V']]
         self.E = self.graph['E']
         self._surface = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+        self.drawn_version = None
         self.edges = {frozenset(e): Edge(thickness=3, group=group, data=e, pm=self.V[e[0]], pn=self.V[e[1]], screen_rect=self.screen_rect, surface=self.surface) for e in self.E}
         self.E = {frozenset(e) for e in self.graph['E']}
         self.points = [self.V[node] for node in self.graph['lines']]
@@ -48,9 +49,10 @@ class DrawnIcon(pygame.sprite.Sprite):
     @property
     def surface(self):
         """
-        Change color based on style.
+        Change color based on style, redrawn only when the path changed.
         """
-        if self.path_obj.edges:
+        if self.path_obj.edges and self.path_obj.version != self.drawn_version:
+            self.drawn_version = self.path_obj.version
             self.draw_lines(style='active', points=[self.V[n] for n in self.path_obj.data])
 
             active_edges = {frozenset(e) for e in self.path_obj.edges}
@@ -73,18 +75,16 @@ class ActionIcon(pygame.sprite.Sprite):
         self.center = scale_point(center, self.scale)
         self.current_graph_type = current_graph_type
         self.name = name
-        self.high_res_surface = pygame.image.load(os.path.join(ICONS_DIR, f'{self.name}.png'))
-        self._surface = pygame.transform.scale(self.high_res_surface, self.screen_rect)
+        self._surface = self.surface
         self.rect = self._surface.get_rect(center=self.center)
 
     @property
     def surface(self):
         """
-        Surface property.
+        Icon in its state (highlighted if it is the current board), from the asset cache.
         """
         current = int(self.current_graph_type == self.name) or ""
-        self.high_res_surface = pygame.image.load(os.path.join(ICONS_DIR, f'{self.name}{current}.png'))
-        self._surface = pygame.transform.scale(self.high_res_surface, self.screen_rect)
+        self._surface = assets.scaled(self.name, str(current), self.screen_rect)
         self.rect = self._surface.get_rect(center=self.center)
         return self._surface
 
@@ -102,17 +102,14 @@ class ToggleIcon(pygame.sprite.Sprite):
 
         self.state = animate_state
         self._surface, self.rect = None, None
-        self.hires_surface = pygame.image.load(os.path.join(ICONS_DIR, f'{self.name}_{int(not self.state)}.png'))
+        self.scale_hires()
 
     @property
     def surface(self):
         """
-        High-resolution icon as a _surface.
+        Icon of the current state, from the asset cache.
         """
-        hires_surface = pygame.image.load(os.path.join(ICONS_DIR, f'{self.name}_{int(not self.state)}.png'))
-        self._surface = pygame.transform.scale(hires_surface, self.screen_rect)
-        self.rect = self._surface.get_rect(center=self.center)
-        return self._surface
+        return self.scale_hires()[0]
 
     def switch(self):
         """
@@ -125,6 +122,6 @@ class ToggleIcon(pygame.sprite.Sprite):
         """
         Draw icon.
         """
-        self._surface = pygame.transform.scale(self.hires_surface, self.screen_rect)
+        self._surface = assets.scaled(self.name, f'_{int(not self.state)}', self.screen_rect)
         self.rect = self._surface.get_rect(center=self.center)
         return self._surface, self.rect
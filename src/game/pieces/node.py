@@ -1,12 +1,13 @@
 """
 Nodes and Edges classes
 """
-import os
 import pygame.sprite
 from pygame import gfxdraw
 from random import randint
 
-from src.game.defs import ICONS_DIR, COLORS
+from src.game.defs import COLORS
+from src.game.graph import Graph
+from src.game.pieces import assets
 from src.game.utils import scale_point
 
 
@@ -32,9 +33,7 @@ class NodeSprite(pygame.sprite.Sprite):
         self.numbered = numbered
         self.screen = screen
         self.style = 'inactive'
-        self.fp_inactive = os.path.join(ICONS_DIR, 'node_inactive_hires.png')
-        hires_surface = pygame.image.load(self.fp_inactive)
-        self.surface = pygame.transform.scale(hires_surface, self.node_rect)
+        self.surface = assets.scaled('node_inactive_hires', size=self.node_rect).copy()
         self.rect = self.surface.get_rect(center=self.center)
         self.set_color()
 
@@ -62,7 +61,7 @@ class NodeSprite(pygame.sprite.Sprite):
         """
         Get label
         """
-        text = pygame.font.SysFont('Oswald', 16).render(str(self.data), True, (255, 0, 255))
+        text = assets.label(str(self.data))
         self.surface.blit(text, text.get_rect(center=(self.radius, self.radius - 1)))
 
     def draw_border(self, style, player=False, radius=8):   # noqa
@@ -89,7 +88,7 @@ class Node(NodeSprite):
     """
     def __init__(self, A=None, players=None, paths=None, **kwargs):
         super().__init__(**kwargs)
-        self.A = A
+        self.A = Graph.of(A)
         self.players = players
         self.paths = paths
 
@@ -113,10 +112,7 @@ class Node(NodeSprite):
         """
         Path in which the node belongs
         """
-        for player_id, player in self.players.data.items():
-            if self.data in player.path.data:
-                return player_id
-        return None
+        return self.players.owner[self.data]
 
     @property
     def is_butt(self):
@@ -138,7 +134,7 @@ class Node(NodeSprite):
         Is node head or butt?
         """
         if self.path:
-            return self.data in (self.path[0], self.path[-1])
+            return self.players.position[self.data] in (0, len(self.path) - 1)
 
     @property
     def is_prev_step(self):
@@ -152,13 +148,13 @@ class Node(NodeSprite):
         """
         Can I pivot with this node?
         """
-        return self.data in self.path[1:-2]
+        return self.path_id is not None and 1 <= self.players.position[self.data] < len(self.path) - 2
 
     def is_adjacent(self, node):
         """
         If node is adjacent to head.
         """
-        return node in self.neighbors
+        return self.A.adjacent(self.data, node)
 
     @property
     def player(self):
@@ -2,18 +2,128 @@
 Path class for player. Container class for placing steps when walking.
 """
 
-from more_itertools import windowed
-from src.game.utils import id_seq
+from operator import index as as_index
+
+from src.game.graph import Graph
 
 
 class Path:
     """
     Path class for container for steps.
+    Mutate through the methods below so that the visited bitmask (node ids as bits) stays in step.
+    listeners: called as listener(path, added, removed, moved) after every change; moved if the nodes kept may have
+    changed position, else only the tail changed.
+    The status is tracked along: breaks counts the consecutive nodes that are not adjacent and edge_set holds the
+    edges between consecutive nodes. Tail changes update them in the size of the change, the rest in one pass.
+    version: counts the changes, so views of the path can tell when to refresh.
     """
-    def __init__(self, A=None, data=None, player_id=0):
-        self.A = A
+    def __init__(self, A=None, data=None, player_id=0, oracle=None):
+        self.A = Graph.of(A)
         self.data = data or []
         self.id = player_id
+        self.oracle = oracle
+        self.mask = 0
+        self._solvable = None
+        self._edges = None
+        self.version = 0
+        self.breaks = 0
+        self.edge_set = set()
+        if self.A is None:
+            self.adjacent = self.no_adjacent
+        elif self.A.masks is not None:
+            self.adjacent = self.bit_adjacent
+        else:
+            self.adjacent = self.A.adjacent
+        self.listeners = []
+        self.assign(self.data)
+
+    @property
+    def solvable(self):
+        """
+        If the path can still be extended to a hamiltonian cycle, asked once per change of the path.
+        """
+        if self.oracle is None:
+            return True
+        if self._solvable is None:
+            self._solvable = self.oracle.solvable(self.data, self.mask)
+        return self._solvable
+
+    def changed(self, added=(), removed=(), moved=True):
+        """
+        Update the visited bitmask with the nodes removed from and added to the path, and tell the listeners.
+        """
+        for n in removed:
+            self.mask &= ~(1 << n)
+        for n in added:
+            self.mask |= 1 << n
+        self._solvable = self._edges = None
+        self.version += 1
+        self.track(added, removed, moved)
+        for listener in self.listeners:
+            listener(self, added, removed, moved)
+
+    def track(self, added, removed, moved):
+        """
+        Update breaks and edge_set: the links to and among removed nodes were cut from the tail, the links to and
+        among added nodes joined it.
+        """
+        if moved:
+            self.breaks = 0
+            self.edge_set.clear()
+            return self.link(self.data, 1)
+        if removed:
+            self.link(self.data[-1:] + list(removed), -1)
+        if added:
+            self.link(self.data[-len(added) - 1:], 1)
+
+    @staticmethod
+    def no_adjacent(u, v):  # noqa
+        """
+        Without a board no nodes are adjacent: every step breaks the path.
+        """
+        return False
+
+    def bit_adjacent(self, u, v):
+        """
+        If u and v are adjacent, read from the bit matrix of the graph.
+        """
+        return self.A.masks[u] >> v & 1
+
+    def link(self, nodes, sign):
+        """
+        Add (sign 1) or take back (sign -1) the links between consecutive nodes.
+        """
+        adjacent = self.adjacent
+        for u, v in zip(nodes, nodes[1:]):
+            if not adjacent(u, v):
+                self.breaks += sign
+            elif sign > 0:
+                self.edge_set.add(frozenset((u, v)))
+            else:
+                self.edge_set.discard(frozenset((u, v)))
+
+    def append(self, node):
+        """
+        Step to node.
+        """
+        self.data.append(node)
+        self.changed(added=(node,), moved=False)
+
+    def extend(self, nodes):
+        """
+        Step along nodes.
+        """
+        nodes = list(nodes)
+        self.data.extend(nodes)
+        self.changed(added=nodes, moved=False)
+
+    def assign(self, nodes):
+        """
+        Replace the whole sequence.
+        """
+        removed = self.data[:]
+        self.data[:] = nodes
+        self.changed(added=self.data, removed=removed)
 
     @property
     def loop_edge(self):
@@ -29,18 +139,20 @@ class Path:
         """
         Maximum number of steps has been reached.
         """
-        return len(self.data) == len(self.A.keys())
+        return len(self.data) == len(self.A)
 
     @property
     def edges(self):
         """
-        Player as edges.
-        windowed(self.path + self.path[:1] if self.is_loop else self.path, 2).
-        If loop but edges need another coloring.
+        Player as edges: pairs of consecutive nodes, closed back to the start if hamiltonian.
+        Built once per change of the path.
         """
-        if self.has_edge:
-            return windowed(self.data + self.data[:1] if self.is_hamiltonian else self.data, 2)
-        return False
+        if not self.has_edge:
+            return False
+        if self._edges is None:
+            closed = self.data[1:] + self.data[:1] if self.is_hamiltonian else self.data[1:]
+            self._edges = list(zip(self.data, closed))
+        return self._edges
 
     @property
     def has_edge(self):
@@ -61,14 +173,23 @@ class Path:
         """
         Get sequence type: snake, loop or broken.
         """
-        return id_seq(self.data, self.A)
+        if self.breaks:
+            return 'broken'
+        return 'loop' if self.is_loop else 'snake'
+
+    @property
+    def is_valid(self):
+        """
+        True if consecutive nodes are all adjacent.
+        """
+        return not self.breaks
 
     @property
     def is_loop(self):
         """
         True if sequence is a loop.
         """
-        return self.seq_type == 'loop'
+        return not self.breaks and bool(self.data) and bool(self.adjacent(self.data[0], self.data[-1]))
 
     @property
     def is_hamiltonian(self):
@@ -114,7 +235,8 @@ class Path:
         if self.is_loop:
             # if not node.is_head:
             idx = self.data.index(node)
-            self.data = self.data[idx + 1:] + self.data[:idx + 1]
+            self.data[:] = self.data[idx + 1:] + self.data[:idx + 1]
+            self.changed()
         else:
             pass
             # raise TypeError('SEQUENCE MUST BE A LOOP')
@@ -127,7 +249,8 @@ class Path:
         """
         idx = self.data.index(node)
         new_path = self.data[:idx]
-        self.data = self.data[idx:]
+        self.data[:] = self.data[idx:]
+        self.changed(removed=new_path)
         return new_path
 
     def skip(self, node):
@@ -136,29 +259,41 @@ class Path:
         """
         idx = self.data.index(node)
         self.data[idx + 1:] = self.data[:idx:-1]
+        self.changed()
 
     def rewind(self, node):
         """
         Move back many steps.
         """
         idx = self.data.index(node)
+        removed = self.data[idx + 1:]
         self.data[:] = self.data[:idx + 1]
+        self.changed(removed=removed, moved=False)
 
     def reverse(self):
         """
         FLIP.
         """
         self.data[:] = self.data[::-1]
+        self.changed()
 
     def back(self):
         """
         Pop last node in sequence.
         """
-        return self.data.pop()
+        node = self.data.pop()
+        self.changed(removed=(node,), moved=False)
+        return node
 
     def __getitem__(self, item):
         return self.data[item]
 
+    def __contains__(self, node):
+        try:
+            return bool(self.mask >> as_index(node) & 1)
+        except (TypeError, ValueError):
+            return False
+
     def __len__(self):
         return len(self.data)
 
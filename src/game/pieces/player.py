@@ -3,6 +3,7 @@ Player class.
 """
 import random
 
+from src.game.graph import Graph
 from src.game.pieces.path import Path
 
 
@@ -10,11 +11,11 @@ class Player:
     """
     Player class
     """
-    def __init__(self, A=None, data=None, player_id=0, players=None, debug=False):
-        self.A = A
-        self.ORD = len(self.A.keys())
+    def __init__(self, A=None, data=None, player_id=0, players=None, debug=False, oracle=None):
+        self.A = Graph.of(A)
+        self.ORD = len(self.A)
         self.id = player_id
-        self.path = Path(A=A, data=data or random.sample(range(self.ORD), 1), player_id=self.id)
+        self.path = Path(A=A, data=data or random.sample(range(self.ORD), 1), player_id=self.id, oracle=oracle)
         self.players = players
         self.debug = debug
 
@@ -23,7 +24,7 @@ class Player:
         """
         Max number steps taken
         """
-        return len(self.players.stepped) == self.ORD
+        return self.players.mask == self.players.full
 
     @property
     def found_solution(self):
@@ -32,6 +33,13 @@ class Player:
         """
         return self.max_stepped and self.path.is_loop
 
+    @property
+    def solvable(self):
+        """
+        If the path can still become a hamiltonian cycle.
+        """
+        return self.path.solvable
+
     @property
     def head(self):
         """
@@ -77,8 +85,8 @@ class Player:
         """
         Take a step, record in stepped.
         """
-        if node not in self.players.stepped:
-            self.path.data.append(node)
+        if not self.players.is_stepped(node):
+            self.path.append(node)
 
     def skip(self, node):
         """
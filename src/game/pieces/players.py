@@ -3,7 +3,10 @@ Players class.
 """
 from typing import Optional
 
+from src.game.graph import Graph
+from src.game.oracle import Oracle
 from src.game.pieces.player import Player
+from src.game.search import bits
 from src.game.utils import unpack
 
 
@@ -11,30 +14,59 @@ class Players:
     """
     Players class to deal with many Players.
     Combine, separate, create Players.
+    Ownership index, kept up to date by listening to the paths: owner[node] is the id of the player whose path holds
+    node (None if free), position[node] its index in that path, mask the bitmask of every stepped node.
     """
 
-    def __init__(self, G, nodes=None):
+    def __init__(self, G, nodes=None, oracle=None):
         self.G = G
-        self.A = self.G['A']
+        self.A = Graph.of(self.G['A'])
         self.ORD = len(self.A)
+        self.full = (1 << self.ORD) - 1
         self.data = {}
         self.current_idx = None
         self.nodes = nodes
+        self.oracle = oracle or Oracle(self.A)
+        self.owner = [None] * self.ORD
+        self.position = [None] * self.ORD
+        self.mask = 0
+
+    def index(self, path, added=(), removed=(), moved=True):
+        """
+        Path listener: update the ownership of the nodes removed from and added to path.
+        """
+        owner, position = self.owner, self.position
+        for n in removed:
+            if owner[n] == path.id:
+                owner[n] = position[n] = None
+                self.mask &= ~(1 << n)
+        if moved:
+            added, start = path.data, 0
+        else:
+            start = len(path.data) - len(added)
+        for at, n in enumerate(added, start):
+            owner[n], position[n] = path.id, at
+            self.mask |= 1 << n
 
     @property
     def stepped(self):
         """
         Nodes which have been stepped.
         """
-        return {*unpack(self.current.path.data)}
-        # return {*unpack([player.path.data for player in self.data.values()])}
+        return set(bits(self.mask))
 
     @property
     def unstepped(self):
         """
         Nodes not taken.
         """
-        return {*range(self.ORD)}.difference(self.stepped)
+        return set(bits(self.full & ~self.mask))
+
+    def is_stepped(self, node) -> bool:
+        """
+        If a player's path holds node.
+        """
+        return bool(self.mask >> node & 1)
 
     @property
     def ends(self):
@@ -67,7 +99,9 @@ class Players:
         Add new path.
         """
         self.current_idx = self.new_key
-        self.data[self.current_idx] = Player(A=self.G['A'], data=data, player_id=self.current_idx, players=self)
+        player = self.data[self.current_idx] = Player(A=self.A, data=data, player_id=self.current_idx, players=self, oracle=self.oracle)
+        player.path.listeners.append(self.index)
+        self.index(player.path)
 
     def __len__(self):
         """
@@ -0,0 +1,72 @@
+"""
+Dead-end and connectivity pruning for the bitset walkers.
+Cuts a branch as soon as its partial path can no longer close into a hamiltonian cycle.
+"""
+from src.game.parity import Parity
+from src.game.search import bits
+
+
+class DeadEnds:
+    """
+    Incremental feasibility checks of a partial path over bitmask adjacency masks.
+    check() validates a whole state once, doomed() only re-examines what the last step changed.
+    Parity is only tested in check(): stepping to an unvisited neighbor never changes its outcome.
+    parity: Parity of the board, colored once per graph (Graph.parity); colored here only if not given.
+    """
+    def __init__(self, masks, origin, parity=None):
+        self.masks = masks
+        self.origin = origin
+        self.full = (1 << len(masks)) - 1
+        self.parity = parity if parity is not None else Parity(masks)
+
+    def check(self, path, visited) -> bool:
+        """
+        Full check of a state: True if it cannot become a hamiltonian cycle.
+        """
+        if not (free := self.full & ~visited):
+            return False
+        masks, head = self.masks, path[-1]
+        if not self.parity.completable(head, self.origin, visited):
+            return True
+        if not masks[self.origin] & free or not masks[head] & free:
+            return True
+        usable = free | 1 << head | 1 << self.origin
+        if any((masks[u] & usable).bit_count() < 2 for u in bits(free)):
+            return True
+        return self.reach(free, free & -free, free) != free
+
+    def doomed(self, path, visited) -> bool:
+        """
+        Incremental check after stepping to path[-1], given path[:-1] passed.
+        Only neighbors of the previous head can lose a usable neighbor, and removing the head from the
+        unvisited set can only split it when the head had two or more unvisited neighbors.
+        """
+        if not (free := self.full & ~visited):
+            return False
+        masks, head, origin = self.masks, path[-1], self.origin
+        if not masks[origin] & free or not (around := masks[head] & free):
+            return True
+        if len(path) > 1 and (prev := path[-2]) != origin:
+            usable = free | 1 << head | 1 << origin
+            for u in bits(masks[prev] & free):
+                if (masks[u] & usable).bit_count() < 2:
+                    return True
+        if around & (around - 1):
+            return self.reach(free, around & -around, around) & around != around
+        return False
+
+    def reach(self, free, seed, goal):
+        """
+        Bit-parallel flood fill of free from seed, stopping early once every node of goal is reached.
+        """
+        masks = self.masks
+        reached = frontier = seed
+        while frontier and reached & goal != goal:
+            grown = 0
+            while frontier:
+                low = frontier & -frontier
+                grown |= masks[low.bit_length() - 1]
+                frontier ^= low
+            frontier = grown & free & ~reached
+            reached |= frontier
+        return reached
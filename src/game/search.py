@@ -0,0 +1,258 @@
+"""
+Bitset search core behind utils.walker and utils.walk.
+Visited and neighbor sets are integer bitmasks, backtrack points live in fixed per-depth slots.
+"""
+from array import array
+from time import perf_counter
+
+
+def bit_adjacency(A, order=None):
+    """
+    Map the nodes of adjacency A to bit positions.
+    order: sequence of nodes giving their bit positions, sorted keys by default.
+    A Graph hands over the bit matrix it already holds.
+    :return: nodes (position -> node), index (node -> position), masks (position -> neighbor bitmask).
+    """
+    if order is None and getattr(A, 'masks', None) is not None:
+        return list(A), A.index, list(A.masks)
+    nodes = list(order) if order is not None else sorted(A.keys())
+    index = {node: pos for pos, node in enumerate(nodes)}
+    masks = [0] * len(nodes)
+    for pos, node in enumerate(nodes):
+        for n in A[node]:
+            if n in index:
+                masks[pos] |= 1 << index[n]
+    return nodes, index, masks
+
+
+def bits(mask):
+    """
+    Iterate positions of the set bits in mask, lowest first.
+    """
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def alt_slots(size):
+    """
+    Backtrack slots, one per depth: a flat unsigned array when every mask fits 64 bits.
+    """
+    return array('Q', bytes(8 * size)) if size <= 64 else [0] * size
+
+
+class SearchStats:
+    """
+    Counters of a search: nodes expanded in total and before the first cycle (or goal) was found.
+    """
+    def __init__(self):
+        self.expanded = 0
+        self.first_cycle = None
+        self.cycles = 0
+        self.pruned = 0
+        self.transposed = 0
+
+    def __repr__(self):
+        return f'expanded: {self.expanded}, first cycle: {self.first_cycle}, cycles: {self.cycles}, pruned: {self.pruned}, transposed: {self.transposed}'
+
+
+class BitSearch:
+    """
+    Depth-first search over a bitmask adjacency.
+    path holds bit positions, alts[d] holds the untried alternatives for path[d].
+    Positions below floor are the fixed prefix and never backtracked.
+    move: ordering with a pick(cand, visited, masks) method, lowest bit first if None.
+    pruner: pruning stage with check() and doomed() methods, or its class, built as pruner(masks, origin, parity).
+    origin: node the cycle has to close on, start[0] by default.
+    adjacency: (nodes, index, masks) of A from bit_adjacency, to skip rebuilding it.
+    table: TranspositionTable of dead states, shared by the searches of a board.
+    parity: Parity of the board for the pruner, the one a Graph keeps by default.
+    dead: if the prefix is doomed, when the caller already knows; the pruner's full check decides it when None.
+    halt, poll: halt() is asked every poll + 1 expansions of an untraced walk, halted tells if it stopped the walk.
+    """
+    def __init__(self, A, start=(0,), walked=None, move=None, stats=None, pruner=None, origin=None, adjacency=None, table=None,
+                 parity=None):
+        self.nodes, self.index, self.masks = adjacency or bit_adjacency(A)
+        self.ORD = len(self.nodes)
+        self.full = (1 << self.ORD) - 1
+        self.identity = self.nodes == list(range(self.ORD))
+        self.path = [self.index[n] for n in start]
+        self.alts = alt_slots(self.ORD + 1)
+        self.floor = len(self.path)
+        self.visited = self.to_mask(start) | self.to_mask(walked or ())
+        self.move = move.bind(self.ORD) if move is not None else None
+        self.stats = stats if stats is not None else SearchStats()
+        self.origin = self.index[start[0] if origin is None else origin]
+        if isinstance(pruner, type):
+            parity = parity if parity is not None else getattr(A, 'parity', None)
+            self.pruner = pruner(self.masks, self.origin, parity)
+        else:
+            self.pruner = pruner
+        self.table = table.bind(self.ORD) if table is not None else None
+        self.halt = None
+        self.poll = 0xFFF
+        self.halted = False
+        self.dead = None
+
+    def to_mask(self, nodes):
+        """
+        Bitmask of the given nodes.
+        """
+        mask = 0
+        for n in nodes:
+            if n in self.index:
+                mask |= 1 << self.index[n]
+        return mask
+
+    def labels(self, path=None):
+        """
+        Path as node labels.
+        """
+        path = self.path if path is None else path
+        return path if self.identity else [self.nodes[p] for p in path]
+
+    def hashes(self, goal=None):
+        """
+        Per-depth hash slots for the table: the slot of the head holds the hash of the visited set and origin (and goal).
+        """
+        table = self.table
+        slots = array('Q', bytes(8 * (self.ORD + 1)))
+        slots[len(self.path) - 1] = table.hash(self.visited, self.path[-1], self.origin, goal) ^ table.head_keys[self.path[-1]]
+        return slots
+
+    def depths(self):
+        """
+        Deepest path length whose states go through the table, and nodes left to visit after path[0].
+        Nodes walked besides the path count as visited throughout.
+        """
+        left = self.ORD - self.visited.bit_count() + len(self.path) - 1
+        return left + 1 - self.table.min_depth, left
+
+    def walker(self, trace=True):
+        """
+        Walk every extension of the prefix, yielding the path after each move and again on each hamiltonian cycle.
+        Unvisits on backtracking. Yields the longest path found once exhausted.
+        trace: if False only the cycles are yielded, and self.halt() is polled every poll + 1 expansions to stop early.
+        A halted walk leaves path, alts and visited in place, so walker() called again (without a table) carries on.
+        With a table, states whose subtree held no cycle are stored on backtracking and skipped when met again;
+        alive is the depth below which the states on the path have led to a cycle.
+        """
+        path, alts, masks, full, floor = self.path, self.alts, self.masks, self.full, self.floor
+        visited, stats, halt, poll = self.visited, self.stats, self.halt, self.poll
+        self.halted = False
+        pick = self.move.pick if self.move is not None else None
+        doomed = self.pruner.doomed if self.pruner is not None else None
+        dead = doomed is not None and (self.pruner.check(path, visited) if self.dead is None else self.dead)
+        if (table := self.table) is not None:
+            probe, store, vkeys, hkeys = table.probe, table.store, table.visited_keys, table.head_keys
+            zh, alive, (deep, left) = self.hashes(), 0, self.depths()
+        longest = self.labels()[:]
+        while True:
+            if trace:
+                yield self.labels()
+            elif halt is not None and not stats.expanded & poll and halt():
+                self.visited, self.halted = visited, True
+                return
+            if not dead and (cand := masks[path[-1]] & ~visited):
+                low = 1 << pick(cand, visited, masks) if pick else cand & -cand
+                alts[len(path)] = cand ^ low
+                path.append(low.bit_length() - 1)
+                visited |= low
+                stats.expanded += 1
+                if len(path) > len(longest):
+                    longest = self.labels()[:]
+            else:
+                d = len(path) - 1
+                while d >= floor and not alts[d]:
+                    d -= 1
+                if table is not None:
+                    for k in range(min(len(path), deep) - 1, max(d, alive) - 1, -1):
+                        store(zh[k] ^ hkeys[path[k]], left - k)
+                    alive = min(alive, d)
+                if d < floor:
+                    self.visited = visited
+                    if trace:
+                        yield longest
+                    return
+                for p in path[d:]:
+                    visited ^= 1 << p
+                low = 1 << pick(alts[d], visited, masks) if pick else alts[d] & -alts[d]
+                alts[d] ^= low
+                path[d:] = [low.bit_length() - 1]
+                visited |= low
+                stats.expanded += 1
+            if table is not None and len(path) <= deep:
+                zh[len(path) - 1] = zh[len(path) - 2] ^ vkeys[path[-1]]
+                if dead := probe(zh[len(path) - 1] ^ hkeys[path[-1]]):
+                    stats.transposed += 1
+                    continue
+            if doomed is not None and (dead := doomed(path, visited)):
+                stats.pruned += 1
+            if visited == full and masks[path[-1]] >> path[0] & 1:
+                if not stats.cycles:
+                    stats.first_cycle = stats.expanded
+                stats.cycles += 1
+                if table is not None:
+                    alive = len(path)
+                yield self.labels()
+
+    def walk_to(self, goal, limit=None, deadline=None):
+        """
+        Search a path from the head to goal.
+        Without a pruner visited nodes stay visited on backtracking, so every node is expanded at most once.
+        With a pruner the search unvisits on backtracking and only returns paths that can still close a cycle,
+        then a table stores the states (keyed with the goal too) from which the goal could not be reached.
+        limit: give up after this many expansions. deadline: give up at this perf_counter() time, polled like halt().
+        """
+        path, alts, masks, floor, poll = self.path, self.alts, self.masks, self.floor, self.poll
+        visited, stats = self.visited, self.stats
+        pick = self.move.pick if self.move is not None else None
+        doomed = self.pruner.doomed if self.pruner is not None else None
+        dead = doomed is not None and (self.pruner.check(path, visited) if self.dead is None else self.dead)
+        if (target := self.index.get(goal)) is None:
+            return None
+        if (table := self.table if doomed is not None else None) is not None:
+            probe, store, vkeys, hkeys = table.probe, table.store, table.visited_keys, table.head_keys
+            zh, (deep, left) = self.hashes(goal=target), self.depths()
+        while limit is None or stats.expanded < limit:
+            if deadline is not None and not stats.expanded & poll and perf_counter() >= deadline:
+                break
+            if not dead and (cand := masks[path[-1]] & ~visited):
+                low = 1 << pick(cand, visited, masks) if pick else cand & -cand
+                alts[len(path)] = cand ^ low
+                path.append(low.bit_length() - 1)
+            else:
+                d = len(path) - 1
+                while d >= floor:
+                    if doomed is None:
+                        alts[d] &= ~visited
+                    if alts[d]:
+                        break
+                    d -= 1
+                if table is not None:
+                    for k in range(min(len(path), deep) - 1, d - 1, -1):
+                        store(zh[k] ^ hkeys[path[k]], left - k)
+                if d < floor:
+                    break
+                if doomed is not None:
+                    for p in path[d:]:
+                        visited ^= 1 << p
+                low = 1 << pick(alts[d], visited, masks) if pick else alts[d] & -alts[d]
+                alts[d] ^= low
+                path[d:] = [low.bit_length() - 1]
+            visited |= low
+            stats.expanded += 1
+            if table is not None and len(path) <= deep:
+                zh[len(path) - 1] = zh[len(path) - 2] ^ vkeys[path[-1]]
+                if dead := probe(zh[len(path) - 1] ^ hkeys[path[-1]]):
+                    stats.transposed += 1
+                    continue
+            if doomed is not None and (dead := doomed(path, visited)):
+                stats.pruned += 1
+            elif path[-1] == target:
+                stats.first_cycle = stats.expanded
+                self.visited = visited
+                return self.labels()[:]
+        self.visited = visited
+        return None
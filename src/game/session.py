@@ -0,0 +1,238 @@
+"""
+Headless game: the board, players, path moves, solvers and win detection, without pygame.
+WalkTheLoop renders a session; bots play sessions directly, by the million across a process pool.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from itertools import cycle
+import random
+
+from src.game.defs import G_TYPES, G_POLYHEDRA
+from src.game.graph import Graph
+from src.game.hint import Hinter
+from src.game.oracle import Oracle
+from src.game.parity import Parity
+from src.game.pieces.players import Players
+from src.game.store import SolutionStore
+from src.game.transposition import TranspositionTable
+from src.game.utils import walk, walker
+
+
+class GameSession:
+    """
+    One game on one board at a time.
+    The solvers (table, parity, oracle, hinter) describe the board, not the game, so they are kept while reset
+    stays on the same board.
+    persist: record found cycles in the board's SolutionStore; simulations leave it off and never touch the disk.
+    seed: seed of the random start nodes and solver restarts.
+    """
+    run_limit = 100_000
+    hint_budget_ms = 50
+
+    def __init__(self, graph_type=None, persist=True, seed=None):
+        self.persist = persist
+        self.random = random.Random(seed)
+        self.graph_iter = cycle(G_TYPES)
+        self.graph_type = None
+        self.G, self.V, self.E, self.A, self.ORD = [None] * 5
+        self.store, self.table, self.parity, self.oracle, self.hinter = [None] * 5
+        self.players, self.walker = None, None
+        self.reset(graph_type)
+
+    @property
+    def player(self):
+        """
+        Player object.
+        """
+        return self.players.current
+
+    @property
+    def path(self):
+        """
+        Path of player.
+        """
+        return self.player.path
+
+    @property
+    def won(self):
+        """
+        If the current player closed a hamiltonian cycle.
+        """
+        return self.player.found_solution
+
+    def set_graph(self, graph_type=None):
+        """
+        Switch to graph_type, or the next board in G_TYPES.
+        """
+        if graph_type:
+            while next(self.graph_iter) != graph_type:
+                pass
+        else:
+            graph_type = next(self.graph_iter)
+        changed = graph_type != self.graph_type
+        self.graph_type = graph_type
+        self.G = G_POLYHEDRA[self.graph_type]
+        self.V, self.E, self.A = self.G['V'], self.G['E'], Graph.of(self.G['A'])
+        self.ORD = len(self.V)
+        return changed
+
+    def reset(self, graph_type=None):
+        """
+        New game on graph_type (the next board if None) with one player on a random start node.
+        """
+        if self.set_graph(graph_type) or self.table is None:
+            self.store = SolutionStore.open(self.graph_type, self.A) if self.persist else None
+            self.table = TranspositionTable()
+            self.parity = Parity.of(self.A)
+            self.oracle = Oracle(self.A, store=self.store, table=self.table)
+            self.hinter = Hinter(self.A, store=self.store, table=self.table)
+        self.walker = walker(self.A)
+        self.players = Players(self.G, oracle=self.oracle)
+        self.players.add_player(data=[self.random.randrange(self.ORD)])
+
+    def action(self, n):
+        """
+        What selecting node n does: 'start', 'switch' (head and origin), 'rewind', 'step' or 'run'.
+        """
+        if self.player.is_new:
+            return 'start'
+        if n == self.player.butt and len(self.path) > 2:
+            return 'switch'
+        if n in self.path:
+            return 'rewind'
+        if self.A.adjacent(self.player.head, n):
+            return 'step'
+        return 'run'
+
+    def select(self, n):
+        """
+        Play node n as a click on it would.
+        :return: the action taken, None if no run to n was found.
+        """
+        action = self.action(n)
+        if action in ('start', 'step'):
+            self.player.step(n)
+        elif action == 'switch':
+            self.player.switch_head()
+        elif action == 'rewind':
+            self.path.rewind(n)
+        elif not self.run(n):
+            return None
+        return action
+
+    def run(self, n):
+        """
+        Random run to goal n.
+        Prefers a run after which the loop can still be closed, falls back to any run.
+        The closable search is skipped when parity already rules the loop out. Searches with utils.walk unwrapped
+        from its timing readout, so sessions stay quiet.
+        """
+        if self.store is not None and (steps := self.store.run_to(self.path.data, n)) is not None:
+            self.path.extend(steps)
+            return True
+        search = walk.__wrapped__
+        head, origin, walked = self.path[-1], self.path[0], self.players.stepped.difference(self.path[-1:])
+        solution = None
+        if self.parity.completable(head, origin, self.path.mask):
+            solution = search(self.A, start=head, goal=n, walked=walked, feasible=True, origin=origin, limit=self.run_limit,
+                              table=self.table)
+        if not solution:
+            solution = search(self.A, start=head, goal=n, walked=walked, prune=len(self.path) > 1)
+        if solution:
+            self.path.extend(solution[1:])
+            return True
+        return False
+
+    def hint(self, budget_ms=None):
+        """
+        Best next step from the head, found within budget_ms so the caller is never blocked for long.
+        """
+        if self.won or not self.path.data:
+            return None
+        return self.hinter.hint(self.path.data, budget_ms or self.hint_budget_ms)
+
+    def start_walker(self):
+        """
+        Start the solver from the current path.
+        """
+        data = self.path.data[:-1] if len(self.path.data) > 1 else [self.random.randrange(self.ORD)] if not self.path.data else self.path.data
+        self.walker = self.solve(data)
+
+    def solve(self, data):
+        """
+        Walk from data towards a loop: along a stored cycle if one continues data, else by search.
+        """
+        if self.store is not None and (completion := self.store.complete(data)):
+            for end in range(len(data), self.ORD + 1):
+                yield completion[:end]
+            return
+        yield from walker(self.A, s=data, order='warnsdorff', feasible=True, table=self.table)
+
+    def advance(self):
+        """
+        Next position of the solver. False when it is exhausted, it then starts over from the path.
+        """
+        try:
+            self.path.assign(next(self.walker))
+            return True
+        except StopIteration:
+            self.start_walker()
+            return False
+
+    def check_win(self):
+        """
+        If the game is won, storing the cycle found.
+        """
+        if self.won:
+            if self.store is not None:
+                self.store.add(self.path.data)
+            return True
+        return False
+
+    def play_out(self, policy='random', max_steps=None, budget_ms=None):
+        """
+        Bot game from the current position: step until every node is walked or the head is stuck.
+        policy: 'random' unvisited neighbor, 'warnsdorff' (fewest onward moves, ties at random) or 'hint'.
+        :return: if the game was won.
+        """
+        path, A, choice = self.path, self.A, self.random.choice
+        for _ in range(max_steps or self.ORD):
+            if len(path) == self.ORD:
+                break
+            free = [n for n in A[path[-1]] if not path.mask >> n & 1]
+            if not free:
+                break
+            if policy == 'hint':
+                node = self.hint(budget_ms)
+            elif policy == 'warnsdorff':
+                onward = {n: sum(not path.mask >> m & 1 for m in A[n]) for n in free}
+                fewest = min(onward.values())
+                node = choice([n for n in free if onward[n] == fewest])
+            else:
+                node = choice(free)
+            path.append(node)
+        return self.check_win()
+
+
+sessions = {}
+
+
+def simulate(graph_type, seed=0, policy='random'):
+    """
+    One bot game, on a session kept per board and process so the board's solvers are built once.
+    :return: board, seed, won and number of nodes walked.
+    """
+    if (session := sessions.get(graph_type)) is None:
+        session = sessions[graph_type] = GameSession(graph_type, persist=False)
+    session.random.seed(seed)
+    session.reset(graph_type)
+    won = session.play_out(policy=policy)
+    return {'graph_type': graph_type, 'seed': seed, 'won': won, 'steps': len(session.path)}
+
+
+def simulate_games(graph_type, games, seed=0, policy='random', workers=None, chunksize=256):
+    """
+    Results of games bot games with consecutive seeds, played across a process pool, in order.
+    """
+    seeds = range(seed, seed + games)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(simulate, [graph_type] * games, seeds, [policy] * games, chunksize=chunksize)
@@ -0,0 +1,170 @@
+"""
+Persistent solution store: known hamiltonian cycles of a board in a compact binary file.
+
+File layout: a header (magic, version, node width in bytes, ORD, adjacency hash) followed by the cycles as
+fixed-width rows of node ids. Rows are canonical: rotated to start at the board's first node and
+directed so that row[1] < row[-1]. The file is named and versioned by the hash of the adjacency,
+so editing a board never serves stale solutions.
+"""
+from collections import OrderedDict
+from hashlib import sha1
+import mmap
+import os
+import struct
+
+import numpy as np
+
+from src.game.defs import SOLUTIONS_DIR
+
+MAGIC, VERSION = b'WTLC', 1
+HEADER = struct.Struct('<4sHHI20s')
+
+
+def graph_hash(A) -> bytes:
+    """
+    SHA-1 of the adjacency, independent of set and dict ordering.
+    """
+    digest = sha1()
+    for node in sorted(A.keys()):
+        digest.update(repr((node, sorted(A[node]))).encode())
+    return digest.digest()
+
+
+def node_dtype(ORD):
+    """
+    Narrowest unsigned dtype holding ORD node ids.
+    """
+    return np.uint8 if ORD <= 1 << 8 else np.uint16 if ORD <= 1 << 16 else np.uint32
+
+
+def canonical_cycle(cycle, first=None):
+    """
+    Rotate a cycle to start at first (its smallest node by default) and direct it so that cycle[1] < cycle[-1].
+    """
+    cycle = list(cycle)
+    at = cycle.index(min(cycle) if first is None else first)
+    cycle = cycle[at:] + cycle[:at]
+    return cycle if cycle[1] < cycle[-1] else cycle[:1] + cycle[:0:-1]
+
+
+class SolutionStore:
+    """
+    Memory-mapped cycles of one board, with an LRU cache of path completions.
+    Rows hold node ids in the dtype fitting ORD, for a board numbered like a Graph.
+    """
+    stores = {}
+
+    def __init__(self, name, A, directory=SOLUTIONS_DIR, cache_size=256):
+        self.name = name
+        self.A = A
+        self.ORD = len(A)
+        self.hash = graph_hash(A)
+        self.dtype = node_dtype(self.ORD)
+        self.filename = os.path.join(directory, f'{name}_{self.hash.hex()[:12]}.cycles')
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.rows, self.positions, self.map = None, None, None
+        self.load()
+
+    @classmethod
+    def open(cls, name, A, **kwargs):
+        """
+        Store of a board, opened once per process.
+        """
+        key = name, graph_hash(A)
+        if key not in cls.stores:
+            cls.stores[key] = cls(name, A, **kwargs)
+        return cls.stores[key]
+
+    def load(self):
+        """
+        Map the file of the board, creating it with an empty body if missing.
+        """
+        if not os.path.exists(self.filename):
+            os.makedirs(os.path.dirname(self.filename), exist_ok=True)
+            with open(self.filename, 'wb') as f:
+                f.write(HEADER.pack(MAGIC, VERSION, np.dtype(self.dtype).itemsize, self.ORD, self.hash))
+        with open(self.filename, 'rb') as f:
+            magic, version, width, ORD, digest = HEADER.unpack(f.read(HEADER.size))
+            if (magic, version, width, ORD, digest) != (MAGIC, VERSION, np.dtype(self.dtype).itemsize, self.ORD, self.hash):
+                raise ValueError(f'{self.filename} does not hold solutions of {self.name}')
+            size = os.fstat(f.fileno()).st_size
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size > HEADER.size else None
+        count = (size - HEADER.size) // (width * self.ORD)
+        self.rows = np.frombuffer(self.map, dtype=self.dtype, count=count * self.ORD, offset=HEADER.size).reshape(count, self.ORD) \
+            if self.map is not None else np.empty((0, self.ORD), dtype=self.dtype)
+        self.positions = None
+        self.cache.clear()
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __iter__(self):
+        for row in self.rows:
+            yield row.tolist()
+
+    def add(self, cycle) -> bool:
+        """
+        Append a hamiltonian cycle unless it is known already.
+        """
+        if len(cycle) != self.ORD or self.find(row := canonical_cycle(cycle, first=0)) is not None:
+            return False
+        with open(self.filename, 'ab') as f:
+            f.write(np.array(row, dtype=self.dtype).tobytes())
+        self.load()
+        return True
+
+    def extend(self, cycles) -> int:
+        """
+        Append many cycles at once, e.g. a catalog from held_karp.iter_cycles.
+        """
+        new = {tuple(canonical_cycle(cycle, first=0)) for cycle in cycles if len(cycle) == self.ORD}.difference(map(tuple, self.rows.tolist()))
+        if new:
+            with open(self.filename, 'ab') as f:
+                f.write(np.array(sorted(new), dtype=self.dtype).tobytes())
+            self.load()
+        return len(new)
+
+    def find(self, path):
+        """
+        Index of a stored cycle in which path runs consecutively in either direction, None if there is none.
+        """
+        if not len(self.rows) or not len(path):
+            return None
+        if self.positions is None:
+            self.positions = np.empty((len(self.rows), self.ORD), dtype=np.int32)
+            np.put_along_axis(self.positions, self.rows.astype(np.intp), np.arange(self.ORD, dtype=np.int32)[None, :], axis=1)
+        if len(path) == 1:
+            return 0
+        steps = (self.positions[:, list(path[1:])] - self.positions[:, list(path[:-1])]) % self.ORD
+        hits = np.flatnonzero((steps == 1).all(axis=1) | (steps == self.ORD - 1).all(axis=1))
+        return int(hits[0]) if len(hits) else None
+
+    def complete(self, path):
+        """
+        A known hamiltonian cycle continuing path: starts with path, None if none is stored.
+        Answers are kept in an LRU cache of cache_size paths.
+        """
+        key = tuple(path)
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            return self.cache[key]
+        completion = None
+        if (idx := self.find(key)) is not None:
+            row = self.rows[idx].tolist()
+            at = row.index(key[0])
+            completion = row[at:] + row[:at]
+            if len(key) > 1 and completion[1] != key[1]:
+                completion = completion[:1] + completion[:0:-1]
+        self.cache[key] = completion
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return completion
+
+    def run_to(self, path, goal):
+        """
+        Steps after the head of path leading to goal along a known cycle, None if none is stored.
+        """
+        if (completion := self.complete(path)) is None or goal not in completion[len(path):]:
+            return None
+        return completion[len(path):completion.index(goal) + 1]
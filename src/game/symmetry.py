@@ -0,0 +1,156 @@
+"""
+Automorphism groups of the boards and symmetry-reduced cycle enumeration.
+A cycle is canonical when, written from the origin (bit 0), it is lexicographically smallest among
+its images under every automorphism in both directions. Only canonical cycles are emitted, with their orbit sizes.
+"""
+from collections import deque
+
+from src.game.pruning import DeadEnds
+from src.game.search import bit_adjacency, bits
+
+
+def refine_colors(masks) -> list[int]:
+    """
+    Color refinement: nodes keep the same color only if their neighbors' colors match, starting from degrees.
+    """
+    colors = [m.bit_count() for m in masks]
+    while True:
+        signatures = [(colors[v], tuple(sorted(colors[u] for u in bits(m)))) for v, m in enumerate(masks)]
+        palette = {sig: c for c, sig in enumerate(sorted(set(signatures)))}
+        refined = [palette[sig] for sig in signatures]
+        if len(palette) == len(set(colors)):
+            return refined
+        colors = refined
+
+
+def automorphisms(masks, limit=None) -> list[tuple[int]]:
+    """
+    Every automorphism of the graph as a tuple mapping bit position -> bit position, the identity first.
+    Nodes are mapped in breadth-first order so each candidate image must neighbor an already mapped image.
+    limit: stop after this many automorphisms.
+    """
+    n = len(masks)
+    colors = refine_colors(masks)
+    classes = {}
+    for v, c in enumerate(colors):
+        classes[c] = classes.get(c, 0) | 1 << v
+    order, seen = [], 0
+    for root in range(n):
+        if not seen >> root & 1:
+            seen |= 1 << root
+            order.append(root)
+            queue = deque([root])
+            while queue:
+                v = queue.popleft()
+                for u in bits(masks[v] & ~seen):
+                    seen |= 1 << u
+                    order.append(u)
+                    queue.append(u)
+    group, image = [], [-1] * n
+
+    def extend(i, used, mapped):
+        """
+        Map order[i] onto every consistent unused node.
+        """
+        if limit is not None and len(group) >= limit:
+            return
+        if i == n:
+            group.append(tuple(image))
+            return
+        v = order[i]
+        wanted = 0
+        for u in bits(masks[v] & mapped):
+            wanted |= 1 << image[u]
+        cand = classes[colors[v]] & ~used
+        if wanted:
+            cand &= masks[(wanted & -wanted).bit_length() - 1]
+        for w in bits(cand):
+            if masks[w] & used == wanted:
+                image[v] = w
+                extend(i + 1, used | 1 << w, mapped | 1 << v)
+        image[v] = -1
+
+    extend(0, 0, 0)
+    return group
+
+
+class Symmetry:
+    """
+    Automorphism group of a board, computed once, and the cycles reduced by it.
+    """
+    def __init__(self, A, limit=None):
+        self.nodes, self.index, self.masks = bit_adjacency(A)
+        self.ORD = len(self.nodes)
+        self.group = automorphisms(self.masks, limit=limit)
+
+    @property
+    def order(self) -> int:
+        """
+        |Aut(G)|.
+        """
+        return len(self.group)
+
+    def orbits(self, group=None) -> list[list]:
+        """
+        Orbits of the nodes under group (the whole automorphism group by default).
+        """
+        group = self.group if group is None else group
+        orbits, seen = [], set()
+        for v in range(self.ORD):
+            if v not in seen:
+                orbit = sorted({g[v] for g in group})
+                seen.update(orbit)
+                orbits.append([self.nodes[p] for p in orbit])
+        return orbits
+
+    def images(self, cycle):
+        """
+        Images of a cycle of bit positions under every automorphism, each written from bit 0 in both directions.
+        """
+        for g in self.group:
+            mapped = [g[p] for p in cycle]
+            at = mapped.index(0)
+            mapped = mapped[at:] + mapped[:at]
+            yield mapped
+            yield mapped[:1] + mapped[:0:-1]
+
+    def canonical(self, cycle):
+        """
+        Canonical form of a cycle (given as node labels) and the size of its orbit.
+        """
+        cycle = [self.index[n] for n in cycle]
+        images = list(self.images(cycle))
+        best = min(images)
+        return [self.nodes[p] for p in best], self.order // images.count(best)
+
+    def cycles(self, feasible=True):
+        """
+        Yield (cycle, orbit size) for one canonical cycle per orbit.
+        Each step only tries nodes that are the smallest of their orbit under the automorphisms fixing the path so far.
+        """
+        if self.ORD < 3:
+            return
+        masks, full = self.masks, (1 << self.ORD) - 1
+        pruner = DeadEnds(masks, 0) if feasible else None
+        path = [0]
+
+        def grow(visited, stab):
+            """
+            Extend path through the canonical candidates.
+            """
+            if visited == full:
+                if masks[path[-1]] & 1:
+                    images = list(self.images(path))
+                    if min(images) == path:
+                        yield [self.nodes[p] for p in path], self.order // images.count(path)
+                return
+            for p in bits(masks[path[-1]] & ~visited):
+                if len(stab) > 1 and any(g[p] < p for g in stab):
+                    continue
+                path.append(p)
+                if pruner is None or not pruner.doomed(path, visited | 1 << p):
+                    yield from grow(visited | 1 << p, [g for g in stab if g[p] == p] if len(stab) > 1 else stab)
+                path.pop()
+
+        if pruner is None or not pruner.check(path, 1):
+            yield from grow(1, [g for g in self.group if g[0] == 0])
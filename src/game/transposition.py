@@ -0,0 +1,89 @@
+"""
+Transposition table of dead search states for the bitset walkers.
+A state is (head, origin, visited set), hashed with 64-bit Zobrist keys updated one step at a time.
+Only states whose whole subtree was searched without success are stored, so a hit can be skipped like a pruned state.
+"""
+from array import array
+from random import Random
+
+
+class TranspositionTable:
+    """
+    Fixed-size table, one entry per slot, indexed by the low bits of the hash.
+    Depth-preferred replacement: a slot is overwritten only by a state with at least as many nodes left to visit,
+    since refuting it saved the larger subtree.
+    size: number of slots, rounded up to a power of two.
+    min_depth: states with fewer nodes left are cheaper to search again than to hash, they are neither stored nor probed.
+    """
+    def __init__(self, size=1 << 16, seed=0, min_depth=4):
+        self.size = 1 << max(size - 1, 1).bit_length()
+        self.slot = self.size - 1
+        self.seed = seed
+        self.min_depth = min_depth
+        self.keys = array('Q', bytes(8 * self.size))
+        self.depths = array('H', bytes(2 * self.size))
+        self.ORD = None
+        self.visited_keys, self.head_keys, self.origin_keys, self.goal_keys = [None] * 4
+        self.stores = self.replaced = 0
+
+    def bind(self, ORD):
+        """
+        Draw the Zobrist keys for a board of ORD nodes, starting over if the table was bound to another size.
+        """
+        if ORD != self.ORD:
+            rng = Random(self.seed)
+            self.visited_keys, self.head_keys, self.origin_keys, self.goal_keys = (
+                [rng.getrandbits(64) for _ in range(ORD)] for _ in range(4))
+            self.ORD = ORD
+            self.clear()
+        return self
+
+    def clear(self):
+        """
+        Forget every state.
+        """
+        self.keys = array('Q', bytes(8 * self.size))
+        self.depths = array('H', bytes(2 * self.size))
+        self.stores = self.replaced = 0
+
+    def hash(self, visited, head, origin, goal=None) -> int:
+        """
+        Zobrist hash of a state from scratch, the searches update it incrementally instead.
+        """
+        key = self.head_keys[head] ^ self.origin_keys[origin] ^ (self.goal_keys[goal] if goal is not None else 0)
+        while visited:
+            low = visited & -visited
+            key ^= self.visited_keys[low.bit_length() - 1]
+            visited ^= low
+        return key
+
+    def probe(self, key) -> bool:
+        """
+        If the state is known to be dead.
+        """
+        return self.keys[key & self.slot] == key
+
+    def store(self, key, depth):
+        """
+        Record a dead state with depth nodes left to visit.
+        """
+        i = key & self.slot
+        if depth >= self.depths[i]:
+            self.replaced += self.keys[i] not in (0, key)
+            self.keys[i], self.depths[i] = key, depth
+            self.stores += 1
+
+    def __len__(self):
+        return sum(1 for key in self.keys if key)
+
+    def __repr__(self):
+        return f'slots: {self.size}, used: {len(self)}, stores: {self.stores}, replaced: {self.replaced}'
+
+
+def transposition_table(table=None):
+    """
+    Get a table by size, or pass a table object through.
+    """
+    if table is None or isinstance(table, TranspositionTable):
+        return table
+    return TranspositionTable(size=table)
@@ -4,7 +4,6 @@ Utilities used by iconsian game.
 from collections import defaultdict
 from datetime import datetime
 from functools import wraps
-from itertools import chain, repeat
 from more_itertools import chunked
 import os
 import pickle
@@ -12,6 +11,16 @@ from random import sample
 import time
 from typing import Iterator, Iterable
 
+from src.game.csr import grid_csr
+from src.game.defs import GRAPHS_DIR
+from src.game.discocube import discocube
+from src.game.graph import Graph
+from src.game.ordering import move_order
+from src.game.parity import two_coloring
+from src.game.pruning import DeadEnds
+from src.game.search import BitSearch, bit_adjacency, bits
+from src.game.transposition import transposition_table
+
 
 _c = 0
 
@@ -77,51 +86,25 @@ def ae_for_grid(x: int = None, y: int = None, z: int = None, both: bool = False)
     """
     Create adjacency and edges dict/list for 2d/3d regular grids.
     Not providing z will create a 2d grid. Setting parameter <both> to True returns both 2d/3d versions as a dict.
+    Built from the vectorized arrays of csr.grid_csr, large grids are better left as graph.Graph.grid(x, y, z).
     """
-    xy_rng = range(_xy := x * y)
-    xy_grid = list(chunked(xy_rng, x))
-    A, E = defaultdict(set), set()
-    for iy in range(y):
-        for ix in range(x):
-            n = xy_grid[iy][ix]
-            if all((ix, iy)) and ix < x - 1 and iy < y - 1:
-                A[n] = {n + 1, n - 1, n - x, n + x}
-                E.update(map(lambda ns: frozenset([n, n + ns]), (1, -1, -x, x)))
-            else:
-                if ix:
-                    A[n].add(n - 1)
-                    E.add(frozenset([n, n - 1]))
-                if ix < x - 1:
-                    A[n].add(n + 1)
-                    E.add(frozenset([n, n + 1]))
-                if iy:
-                    A[n].add(n - x)
-                    E.add(frozenset([n, n - x]))
-                if iy < y - 1:
-                    A[n].add(n + x)
-                    E.add(frozenset([n, n + x]))
-    if not z:
-        return A, E
-    A3 = {k: set() for k in range(x * y * z)}
-    for m in range(_xy):
-        A3[m] = {*A[m], m + _xy}
-        for i in range(1, z):
-            n = m + (floor := i * _xy)
-            A3[n] = {x + floor for x in A[m]}.union({n - _xy} if i == z - 1 else {n - _xy, n + _xy})
-    E3 = {*map(frozenset, chain.from_iterable(map(lambda k: zip(repeat(k), A[k]), A)))}
-    if not both:
-        return A3, E3
-    return {2: (A, E), 3: (A3, E3)}
+    if both:
+        return {2: ae_for_grid(x, y), 3: ae_for_grid(x, y, z)}
+    indptr, indices, edges, _ = grid_csr(x, y, z)
+    bounds, indices = indptr.tolist(), indices.tolist()
+    A = defaultdict(set, {n: set(indices[bounds[n]:bounds[n + 1]]) for n in range(len(bounds) - 1)})
+    return A, set(map(frozenset, edges.tolist()))
 
 
 def id_seq(seq, A) -> str or bool:
     """
     Certify sequence, return sequence type broken, loop, or snake.
     """
+    adjacent = A.adjacent if isinstance(A, Graph) else lambda u, v: u in A[v]
     for s in range(1, len(seq)):
-        if seq[s - 1] not in A[seq[s]]:
+        if not adjacent(seq[s - 1], seq[s]):
             return 'broken'
-    if seq[0] in A[seq[-1]]:
+    if adjacent(seq[0], seq[-1]):
         return 'loop'
     return 'snake'
 
@@ -151,13 +134,12 @@ def print_xy_grid(x, y):
 def cc_from_a(A, both: bool = False, oddeven: bool = False):
     """
     Returns a dict mapping a node to its chromatic coloring.
+    Breadth-first 2-coloring, each component from its lowest node; raises ValueError if A is not bipartite.
     """
-    odd_even = {0: {0}, 1: {*A[0]}}
-    while set(A.keys()).difference(odd_even[0].union(odd_even[1])):
-        for odd in odd_even[0]:
-            odd_even[1].update(A[odd])
-        for even in odd_even[1]:
-            odd_even[0].update(A[even])
+    nodes, _, masks = bit_adjacency(A)
+    if (sides := two_coloring(masks)) is None:
+        raise ValueError('graph is not bipartite')
+    odd_even = {color: {nodes[p] for p in bits(side)} for color, side in enumerate(sides)}
     colored_nodes = {number: key for key in odd_even.keys() for number in odd_even[key]}
     return odd_even if oddeven else colored_nodes, odd_even if both else colored_nodes
 
@@ -194,31 +176,22 @@ def unpack(nested_list) -> Iterator[int]:
 
 
 @timed
-def walk(A, start=0, walked=None, goal=None, shuffle=True, prune=False) -> list[int]:
+def walk(A, start=0, walked=None, goal=None, shuffle=True, prune=False, order=None, seed=None, stats=None,
+         feasible=False, origin=None, limit=None, table=None, deadline=None) -> list[int]:
     """
     General brute-force play algorithm.
+    Walked nodes are masked out of the search, so prune only skips them in the bit adjacency.
+    order: move ordering ('first', 'random', 'warnsdorff'), random if shuffle else first by default.
+    feasible: only return a path after which the walked nodes can still close into a hamiltonian cycle on origin.
+    limit: give up after this many expansions. deadline: give up at this perf_counter() time.
+    table: TranspositionTable (or its size) of the states the goal was not reachable from, used when feasible.
     """
-    if prune:
+    if prune and not feasible:
         A = prune_graph(A, walked)
-    if shuffle:
-        A = shuffle_adj(A)
-    uu: list = []
-    path = [start]
-    walked.add(start)
-    while True:
-        if nxt := set(A[path[-1]].difference(walked)):
-            step = nxt.pop()
-            path.append(step)
-            walked.add(step)
-            if nxt:
-                uu += [(len(path) - 1, n) for n in nxt]
-        else:
-            if uu:
-                path[u[0]:] = [(u := uu.pop())[1]]
-            else:
-                break
-        if path[-1] == goal:
-            return path
+    move = move_order(order or ('random' if shuffle else None), seed=seed)
+    search = BitSearch(A, start=(start,), walked=walked, move=move, stats=stats, pruner=DeadEnds if feasible else None, origin=origin,
+                        table=transposition_table(table))
+    return search.walk_to(goal, limit=limit, deadline=deadline)
 
 
 def shuffle_adj(adj):
@@ -228,12 +201,36 @@ def shuffle_adj(adj):
     return {k: frozenset(sample(v, len(v))) for k, v in adj.items()}
 
 
-def get_G(ORD):
+def get_G(ORD, directory=GRAPHS_DIR):
+    """
+    Get DC graph: {'A': Graph, 'V': vertex coordinates, 'E': edges}, memory-mapped from g_<ORD>.graph in directory.
+    A g_<ORD>.pickle found there instead is converted on first use, without either the graph is generated and saved.
+    """
+    filename = os.path.join(directory, f'g_{ORD}.graph')
+    if not os.path.exists(filename):
+        if os.path.exists(pickle_file := os.path.join(directory, f'g_{ORD}.pickle')):
+            convert_pickle(pickle_file, filename)
+        else:
+            os.makedirs(directory, exist_ok=True)
+            discocube(ORD).save(filename)
+    A = Graph.load(filename)
+    return {'A': A, 'V': A.coords, 'E': A.edges}
+
+
+def convert_pickle(pickle_file, filename=None):
     """
-    Get DC graph.
+    Convert a pickled graph to the memory-mapped graph format, next to the pickle by default.
+    The pickle holds a dict with the adjacency under 'A' (and coordinates under 'V'), or the adjacency itself.
+    Nodes other than 0..ORD-1, e.g. coordinate tuples, are numbered in sorted order and kept as the coordinates.
     """
-    fpg = os.path.join('/home/rommelo/Repos/discocube/data/graphs/dcgrid', f'g_{ORD}')
-    return pickleload(fpg)
+    G = pickleload(pickle_file, raise_error=True)
+    A, V = (G['A'], G.get('V')) if isinstance(G, dict) and 'A' in G else (G, None)
+    if (nodes := sorted(A)) != list(range(len(nodes))):
+        index = {node: n for n, node in enumerate(nodes)}
+        A, V = {index[node]: {index[m] for m in A[node]} for node in nodes}, V if V is not None else nodes
+    filename = filename or f'{os.path.splitext(pickle_file)[0]}.graph'
+    Graph.from_adjacency(A).save(filename, coords=V)
+    return filename
 
 
 def pickleload(filename, mode='rb', raise_error=False):
@@ -261,34 +258,17 @@ def scale_vertices(vertices, scale=10):
     return [(a * scale, b * scale) for a, b in vertices]
 
 
-def walker(A, s: tuple[int] = (0,)):
+def walker(A, s: tuple[int] = (0,), order=None, seed=None, stats=None, feasible=False, table=None):
     """
     General brute-force walk algorithm.
-    """
-    longest_move = []
-    ORD = len(A)
-    uu: list = []
-    loops: set = set()
-    w: list = [*s]
-    while True:
-        # time.sleep(0.1)
-        yield w
-        if nxt := A[w[-1]].difference(w):
-            w.append(nxt.pop())
-            if len(w) > len(longest_move):
-                longest_move = w.copy()
-            if nxt:
-                uu += [(len(w) - 1, n) for n in nxt]
-        else:
-            if uu:
-                w[u[0]:] = [(u := uu.pop())[1]]
-            else:
-                yield longest_move
-                return
-        if len(w) == ORD:
-            if w[0] in A[w[-1]]:
-                loops.add(tuple(w))
-                yield w
+    order: move ordering ('first', 'random', 'warnsdorff'), node order by default.
+    stats: SearchStats filled with the nodes expanded, in total and up to the first cycle.
+    feasible: cut branches that can no longer close into a hamiltonian cycle.
+    table: TranspositionTable (or its size) skipping states already found to lead to no cycle.
+    """
+    search = BitSearch(A, start=s, move=move_order(order, seed=seed), stats=stats, pruner=DeadEnds if feasible else None,
+                       table=transposition_table(table))
+    yield from search.walker()
 
 
 def scale_point(point, scale, intd=True):
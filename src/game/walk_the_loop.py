@@ -1,34 +1,35 @@
 """
 Platonian Game.
 """
-import random
-from itertools import cycle
 import pygame.transform
-from pygame.locals import MOUSEBUTTONDOWN, KEYDOWN, K_ESCAPE, QUIT, K_r, K_RIGHT, K_SPACE
+from pygame.locals import MOUSEBUTTONDOWN, KEYDOWN, K_ESCAPE, QUIT, K_r, K_RIGHT, K_SPACE, K_h
 
+from src.game.pieces import assets
 from src.game.pieces.edge import Edge
 from src.game.pieces.icons import ActionIcon, DrawnIcon, ToggleIcon
 from src.game.pieces.node import Node
-from src.game.pieces.players import Players
-from src.game.defs import COLORS, G_TYPES, G_POLYHEDRA
-from src.game.utils import time, walk, walker
+from src.game.defs import COLORS, G_TYPES
+from src.game.frames import FrameScheduler
+from src.game.session import GameSession
+from src.game.utils import time
 
 
 class WalkTheLoop:
     """
     Icosian Game
+    Renders and drives a GameSession, which holds the board, players and rules.
     """
     original_size = 1000
+    fps, idle_ms = 60, 250
     new, winning, losing = [False] * 3
     blinking = True
     screen = None
     dashed_edges, buttons, animations = None, {}, {}
-    edges, nodes, players, clock = [None] * 4
+    edges, nodes, clock, frames, session = [None] * 5
     update, running = [None] * 2
-    G, V, E, A, ORD = [None] * 5
-    walker = None
+    styles_key, drawn_key, node_styles, edge_styles = None, None, {}, {}
+    shown_nodes, shown_edges, touched_edges = set(), set(), set()
     all_sprites_grp, edges_grp, nodes_grp, buttons_grp = (pygame.sprite.Group() for _ in range(4))
-    graph_iter = cycle(G_TYPES)
 
     def __init__(self, screen_size=(1000, 1000), numbered=True, graph_type=None, animate=False):
 
@@ -36,11 +37,53 @@ class WalkTheLoop:
         self.screen_rect = screen_size
         self.screen_scale = self.screen_rect[0] / self.original_size
         self.numbered = numbered
-        self.graph_type = graph_type
         self.animate = animate
 
+        self.session = GameSession(graph_type=graph_type)
         self.init_screen_clock()
-        self.reset_game(graph_type=self.graph_type)
+        self.reset_view()
+
+    @property
+    def graph_type(self):
+        """
+        Name of the board.
+        """
+        return self.session.graph_type
+
+    @property
+    def V(self):
+        """
+        Vertex positions of the board.
+        """
+        return self.session.V
+
+    @property
+    def E(self):
+        """
+        Edges of the board.
+        """
+        return self.session.E
+
+    @property
+    def A(self):
+        """
+        Adjacency of the board.
+        """
+        return self.session.A
+
+    @property
+    def ORD(self):
+        """
+        Number of nodes.
+        """
+        return self.session.ORD
+
+    @property
+    def players(self):
+        """
+        Players of the session.
+        """
+        return self.session.players
 
     @property
     def player(self):
@@ -56,26 +99,40 @@ class WalkTheLoop:
         """
         return self.player.path
 
+    def hint(self, budget_ms=None):
+        """
+        Best next step from the head, found within budget_ms.
+        """
+        return self.session.hint(budget_ms)
+
     def init_screen_clock(self):
         """
         Init game at the beginning.
         """
         pygame.init()
         self.screen = pygame.display.set_mode(self.screen_rect)
-        self.clock = pygame.time.Clock()
-        self.clock.tick(30)
+        assets.preload()
+        self.frames = FrameScheduler(fps=self.fps, idle_ms=self.idle_ms)
+        self.clock = self.frames.clock
 
     def reset_game(self, graph_type=None):
         """
-        Create new containers.
+        New game on graph_type, the next board if None, and new containers.
+        """
+        self.session.reset(graph_type)
+        self.reset_view()
+
+    def reset_view(self):
+        """
+        New containers, sprites and flags for the game of the session.
         """
-        self.set_graph(graph_type=graph_type)
-        self.walker = walker(self.A)
         self.edges = {frozenset(edge): None for edge in self.E}
         self.dashed_edges = {frozenset(edge): None for edge in self.E}
         self.nodes = {node: None for node in self.A.keys()}
         self.blinking = True
-        self.players = Players(self.G, nodes=self.nodes)
+        self.players.nodes = self.nodes
+        self.styles_key, self.drawn_key, self.node_styles, self.edge_styles = None, None, {}, {}
+        self.shown_nodes, self.shown_edges, self.touched_edges = set(), set(), set()
         self.add_animations()
         self.make_sprite_grps()
         self.reset_board()
@@ -88,20 +145,6 @@ class WalkTheLoop:
         self.animations['blinking'] = pygame.USEREVENT + 1
         pygame.time.set_timer(self.animations['blinking'], 20)
 
-    def set_graph(self, graph_type=None):
-        """
-        Initialize game with new graph.
-        """
-        if graph_type:
-            while next(self.graph_iter) != graph_type:
-                pass
-            self.graph_type = graph_type
-        else:
-            self.graph_type = next(self.graph_iter)
-        self.G = G_POLYHEDRA[self.graph_type]
-        self.V, self.E, self.A = self.G['V'], self.G['E'], self.G['A']
-        self.ORD = len(self.V)
-
     def make_sprite_grps(self):
         """
         Make groups for sprites.
@@ -112,7 +155,6 @@ class WalkTheLoop:
         """
         Initialize pygame, draw board.
         """
-        self.players.add_player()
         self.blinking_nodes.extend(list(self.A[self.path.data[-1]]))
         self.add_nodes_edges()
         self.add_buttons()
@@ -212,6 +254,7 @@ class WalkTheLoop:
         for entity in self.all_sprites_grp:
             self.screen.blit(entity.surface, entity.rect)
         pygame.display.flip()
+        self.drawn_key = self.board_key()
 
     def reset_flags(self):
         """
@@ -238,12 +281,18 @@ class WalkTheLoop:
     def play(self):
         """
         Player play.
+        At most fps frames a second, drawn only when input, blinking, the animation or a path changed the board; when
+        nothing animates the loop sleeps on the event queue.
         """
         self.update = True
         self.animate, self.new = [False] * 2
         while self.running:
-            for event in pygame.event.get():
-                if event.type == MOUSEBUTTONDOWN:
+            events = self.frames.events(idle=not (self.animate or self.blinking))
+            handled = any(event.type in (MOUSEBUTTONDOWN, KEYDOWN, self.animations['blinking']) for event in events)
+            for event in events:
+                if event.type == QUIT:
+                    self.running = False
+                elif event.type == MOUSEBUTTONDOWN:
                     self.reset_blinking()
                     self.parse_click()
                 elif event.type == KEYDOWN:
@@ -254,18 +303,21 @@ class WalkTheLoop:
                         self.animate = not self.animate
                     elif event.key == K_r:
                         self.reset_game(graph_type=self.graph_type)
+                    elif event.key == K_h:
+                        self.animate = False
+                        if (node := self.hint()) is not None:
+                            self.player.step(node)
                     elif event.key == K_SPACE:
                         self.animate = not self.animate
                         self.buttons['play&pause'].switch()
-                    elif event.type == QUIT:
-                        self.running = False
-
                 elif self.blinking and self.path.data:
                     self.set_blinking(event)
             self.animate_path()
             self.check_status()
             self.renew_sprites()
-            self.draw_sprites()
+            if drawn := handled or self.animate or self.board_key() != self.drawn_key:
+                self.draw_sprites()
+            self.frames.end(drawn)
             self.check_reset()
         pygame.quit()
 
@@ -278,6 +330,7 @@ class WalkTheLoop:
             left_node = self.player.head
             for node in self.A[self.path.data[-1]]:
                 edge = frozenset((left_node, node))
+                self.touched_edges.add(edge)
                 if not self.dashed_edges[edge]:
                     self.nodes[node].set_color('inactive')
                     self.nodes[node].set_color('inactive')
@@ -301,27 +354,17 @@ class WalkTheLoop:
 
         if self.animate:
             self.reset_blinking()
-            try:
-                self.path.data[:] = next(self.walker)
-            except StopIteration:
+            if not self.session.advance():
                 self.animate = False
-                self.start_walker()
             self.running = True
         else:
-            self.start_walker()
-
-    def start_walker(self):
-        """
-        Start walker iterator according to current path.
-        """
-        data = self.path.data[:-1] if len(self.path.data) > 1 else [random.randint(0, self.ORD + 1)] if not self.path.data else self.path.data
-        self.walker = walker(self.A, s=data)
+            self.session.start_walker()
 
     def check_status(self):
         """
         Check if a loop has been found.
         """
-        if self.player.found_solution:
+        if self.session.check_win():
             self.show_status('winning')
             self.new = not self.animate
         else:
@@ -354,7 +397,7 @@ class WalkTheLoop:
                     return self.reset_game(self.graph_type)
                 elif button.name == 'next':
                     self.screen.fill(COLORS['BLACK'])
-                    return self.reset_game(next(self.graph_iter))
+                    return self.reset_game()
                 elif button.name in G_TYPES:
                     self.screen.fill(COLORS['BLACK'])
                     self.animate = False
@@ -362,17 +405,11 @@ class WalkTheLoop:
         for n, node in self.nodes.items():
             if node.rect.collidepoint(pygame.mouse.get_pos()):
                 self.animate = False
-                if self.player.is_new:
-                    return self.player.step(n)
-                if n == self.player.butt and len(self.path) > 2:
-                    return self.player.switch_head()
-                elif n in self.player.path:
-                    return self.path.rewind(n)
-                elif n not in self.player.path:
-                    if node.is_adjacent(self.player.head):
-                        self.reset_blinking()
-                        return self.player.step(n)
-                    return self.run(n)
+                if self.session.action(n) == 'step':
+                    self.reset_blinking()
+                if self.session.select(n) is None:
+                    print('no solution')
+                return
 
     def reset_blinking(self, style='inactive'):
         """
@@ -382,6 +419,8 @@ class WalkTheLoop:
             self.nodes[n].set_color(style)
         self.dashed_edges = {frozenset(edge): None for edge in self.E}
         self.blinking = not style == 'inactive'
+        if not self.blinking:
+            pygame.time.set_timer(self.animations['blinking'], 0)
 
     def set_node_edge(self, node=None, edge=None, style='active'):
         """
@@ -399,6 +438,7 @@ class WalkTheLoop:
     def show_status(self, status='winning'):
         """
         Set flags for winning, resulting in winning COLORS (GREEN).
+        Every node and edge counts as shown and the styles as stale, so the next renew restyles the whole board.
         """
         self.screen.fill(COLORS['GREEN'])
         self.update = False
@@ -413,55 +453,75 @@ class WalkTheLoop:
                 self.set_node_edge(edge=edge, style=status)
             else:
                 self.set_node_edge(edge=edge, style='inactive')
-
-    def run(self, n):
-        """
-        Random run to goal n.
-        """
-        if solution := walk(self.A, start=self.path[-1], goal=n, walked=self.players.stepped.difference(self.path[-1:]), prune=len(self.path) > 1):
-            self.path.data.extend(solution[1:])
-        else:
-            print('no solution')
+        self.shown_nodes, self.shown_edges, self.styles_key = set(self.nodes), set(self.edges), None
 
     def renew_sprites(self):
         """
         Renew (deactivate and color) edges and nodes.
         """
         if self.update:
-            if self.players.stepped:
+            if self.players.mask:
                 self.renew_nodes()
                 self.renew_edges()
 
+    def board_key(self):
+        """
+        Version of every path: changes whenever a path does.
+        """
+        return tuple((player_id, player.path.version) for player_id, player in self.players.data.items())
+
+    def board_styles(self):
+        """
+        Style of every node and edge on a path, the rest being inactive.
+        Recomputed only when the version of a path changed.
+        """
+        key = self.board_key()
+        if key != self.styles_key:
+            self.node_styles, self.edge_styles = {}, {}
+            for player in self.players.data.values():
+                self.node_styles.update(dict.fromkeys(player.path.data, 'active'))
+                if player.path:
+                    self.renew_ends(player)
+                if player.path.has_edge:
+                    self.edge_styles.update(dict.fromkeys(map(frozenset, player.path.edges), 'active'))
+            self.styles_key = key
+        return self.node_styles, self.edge_styles
+
     def renew_nodes(self):
         """
-        Gray out nodes then recolor.
+        Restyle the nodes that left the paths or whose style differs from the board's, leaving blinking ones.
         """
-        for node in self.nodes.values():
-            if not node.style == 'blink':
-                node.set_color('inactive')
-        for player in self.players.data.values():
-            for n in player.path:
-                self.set_node_edge(node=n, style='active')
-            if player.path:
-                self.renew_ends(player)
+        styles = self.board_styles()[0]
+        for n in self.shown_nodes.difference(styles):
+            if self.nodes[n].style not in ('inactive', 'blink'):
+                self.set_node_edge(node=n, style='inactive')
+        for n, style in styles.items():
+            node = self.nodes[n]
+            if node.style != style or style == 'active' and node.player_id != self.player.id:
+                self.set_node_edge(node=n, style=style)
+        self.shown_nodes = set(styles)
 
     def renew_edges(self):
         """
-        Gray out nodes then recolor.
-        Assign player_id to each node.
+        Restyle the edges that left the paths, or were dashed by blinking, and the path edges not drawn as such.
+        While blinking the stale edges are kept for later.
         """
+        styles = self.board_styles()[1]
+        stale = (self.shown_edges | self.touched_edges).difference(styles)
         if not self.blinking:
-            for edge in self.E:
+            for edge in stale:
                 self.set_node_edge(edge=edge, style='inactive')
-        for player in self.players.data.values():
-            path = player.path
-            if path.has_edge:
-                for e in path.edges:
-                    self.set_node_edge(edge=e, style='active')
+            stale = set()
+            self.touched_edges.clear()
+        for edge, style in styles.items():
+            edge_obj = self.edges[edge]
+            if edge_obj.style != style or edge_obj.color is None:
+                self.set_node_edge(edge=edge, style=style)
+        self.shown_edges = stale | styles.keys()
 
     def renew_ends(self, player):
         """
-        Refresh head or origin.
+        Style head and origin.
         """
-        for idx, style in enumerate(('head', 'origin')):
-            self.set_node_edge(node=player.ends[idx], style=style)
+        for idx, style in enumerate(('head' if player.solvable else 'losing', 'origin')):
+            self.node_styles[player.ends[idx]] = style
@@ -2,15 +2,19 @@
 Main for playing platonic ham.
 """
 
+from src.game.defs import FRAME_STATS
 from src.game.walk_the_loop import WalkTheLoop
 
 
-def main(screen_size=(1000, 1000), numbered=True):
+def main(screen_size=(1000, 1000), numbered=True, frame_stats=FRAME_STATS):
     """
     Run Icosian Game.
+    frame_stats: print the frame-time stats on exit, on by default when WALK_THE_LOOP_FRAME_STATS is set.
     """
     game = WalkTheLoop(screen_size=screen_size, numbered=numbered)
     game.play()
+    if frame_stats:
+        print(game.frames.report())
 
 
 if __name__ == '__main__':